@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Password hashing offload benchmark
+
+Drives a mixed workload of logins and directory reads against the FastAPI app
+in-process and compares latency with bcrypt running inline on the event loop
+versus on the password pool.
+
+Usage (from backend/, with MONGO_URL and DB_NAME pointing at a scratch database):
+    python -m benchmarks.bench_password_pool --logins 50 --reads 200
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import app  # noqa: E402
+from utils.password_pool import password_pool  # noqa: E402
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name, latencies):
+    return {
+        "endpoint": name,
+        "count": len(latencies),
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+async def timed(client, method, url, bucket, scheduled, **kwargs):
+    # Latency is measured from the intended send time so that time spent
+    # waiting for a blocked event loop is included.
+    response = await client.request(method, url, **kwargs)
+    bucket.append(time.perf_counter() - scheduled)
+    response.raise_for_status()
+
+
+async def run_mixed(client, credentials, logins, reads, rate):
+    login_latencies, read_latencies = [], []
+    kinds = ["login"] * logins + ["read"] * reads
+    random.Random(0).shuffle(kinds)
+    interval = 1.0 / rate
+    tasks = []
+    started = time.perf_counter()
+    for i, kind in enumerate(kinds):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if kind == "login":
+            coro = timed(client, "POST", "/api/auth/login", login_latencies, scheduled, json=credentials)
+        else:
+            coro = timed(client, "GET", "/api/users", read_latencies, scheduled, params={"limit": 20})
+        tasks.append(asyncio.create_task(coro))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    return elapsed, summarize("POST /api/auth/login", login_latencies), summarize("GET /api/users", read_latencies)
+
+
+async def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100.0, help="requests per second")
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:8]}@flowart.bench", "password": "bench-password"}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        db = app.state.db
+        response = await client.post("/api/auth/register", json={"name": "Bench User", **credentials})
+        response.raise_for_status()
+        try:
+            for mode in args.modes.split(","):
+                password_pool.configure(mode=mode)
+                elapsed, login_stats, read_stats = await run_mixed(client, credentials, args.logins, args.reads, args.rate)
+                print(f"\nmode={mode} ({password_pool.workers} workers) total {elapsed:.2f}s, "
+                      f"max queue depth {password_pool.stats()['max_queue_depth']}")
+                for row in (login_stats, read_stats):
+                    print(f"  {row['endpoint']:<22} n={row['count']:<5} mean={row['mean_ms']:8.1f}ms "
+                          f"p50={row['p50_ms']:8.1f}ms p95={row['p95_ms']:8.1f}ms max={row['max_ms']:8.1f}ms")
+        finally:
+            await db.users.delete_one({"email": credentials["email"]})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Directory payload size benchmark
+
+Measures GET /api/users page size (raw and gzipped) and serialization time
+for the full profile, ?view=card and a minimal ?fields= selection.
+
+By default pages are built in-process from synthetic artists, with each
+selection applied exactly as routes.users applies it. With --url the
+numbers come from a running server instead.
+
+Usage (from backend/):
+    python -m benchmarks.bench_payload_size --page-size 24
+    python -m benchmarks.bench_payload_size --url http://localhost:8001
+"""
+
+import argparse
+import gzip
+import random
+import sys
+import timeit
+from pathlib import Path
+
+import httpx
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.load_test import synthetic_artists  # noqa: E402
+from utils.selection import resolve_selection, selection_projection, to_response  # noqa: E402
+from seed_data import prepare_user_document  # noqa: E402
+from utils.serialization import dumps  # noqa: E402
+
+SELECTIONS = [
+    ("full", {}),
+    ("view=card", {"view": "card"}),
+    ("fields=min", {"fields": "id,name,username,avatar"}),
+]
+
+
+def apply_projection(doc, projection):
+    """Apply a top-level inclusion or exclusion projection like MongoDB does"""
+    if any(projection.values()):
+        return {k: v for k, v in doc.items() if k == "_id" or projection.get(k)}
+    return {k: v for k, v in doc.items() if k not in projection}
+
+
+def local_page(documents, params):
+    selected = resolve_selection(params.get("fields"), params.get("view"))
+    projection = selection_projection(selected)
+    return lambda: dumps([to_response(apply_projection(doc, projection), selected) for doc in documents])
+
+
+def report(name, body, seconds=None):
+    timing = f"{seconds * 1e6:>10.1f}" if seconds is not None else f"{'-':>10}"
+    print(f"{name:<12} {len(body):>10} {len(gzip.compress(body)):>10} {timing}")
+    return len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="measure a running server instead of in-process pages")
+    parser.add_argument("--page-size", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'selection':<12} {'bytes':>10} {'gzip':>10} {'build µs':>10}")
+    sizes = {}
+    if args.url:
+        with httpx.Client(base_url=args.url) as client:
+            for name, params in SELECTIONS:
+                response = client.get("/api/users", params={"limit": args.page_size, **params})
+                response.raise_for_status()
+                sizes[name] = report(name, response.content)
+    else:
+        rng = random.Random(42)
+        documents = []
+        for profile in synthetic_artists(args.page_size, "bench", rng):
+            doc = prepare_user_document(profile, "$2b$12$" + "x" * 53)
+            doc["_id"] = ObjectId()
+            documents.append(doc)
+        for name, params in SELECTIONS:
+            build = local_page(documents, params)
+            seconds = timeit.timeit(build, number=args.repeat) / args.repeat
+            sizes[name] = report(name, build(), seconds)
+
+    full = sizes["full"]
+    for name, size in sizes.items():
+        if name != "full":
+            print(f"{name}: {100 * (1 - size / full):.0f}% smaller than full")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Response serialization microbenchmark
+
+Compares FastAPI's default response path (response_model validation followed
+by jsonable_encoder and json.dumps) with utils.serialization's pydantic-core
+path for user and status check lists of 10/100/1000 items.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --repeat 200
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.status import StatusCheck  # noqa: E402
+from seed_data import SEED_USERS  # noqa: E402
+from utils.serialization import _json_adapter  # noqa: E402
+
+
+def make_users(count):
+    users = []
+    for i in range(count):
+        user = dict(SEED_USERS[i % len(SEED_USERS)])
+        user.pop("password")
+        user["id"] = uuid.uuid4().hex[:24]
+        user["createdAt"] = datetime.utcnow()
+        user["updatedAt"] = datetime.utcnow()
+        users.append(user)
+    return users
+
+
+def make_status_checks(count):
+    return [
+        {"id": str(uuid.uuid4()), "client_name": f"client-{i % 20}", "timestamp": datetime.now(timezone.utc)}
+        for i in range(count)
+    ]
+
+
+def default_path(adapter):
+    # What FastAPI does for response_model: validate, dump, encode, json.dumps
+    def run(data):
+        validated = adapter.validate_python(data)
+        content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return run
+
+
+def fast_path(data):
+    return _json_adapter.dump_json(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = [
+        ("users", make_users, default_path(TypeAdapter(List[Dict[str, Any]]))),
+        ("status", make_status_checks, default_path(TypeAdapter(List[StatusCheck]))),
+    ]
+    print(f"{'payload':<8} {'items':>6} {'default µs':>12} {'fast µs':>10} {'speedup':>8}")
+    for name, factory, default in cases:
+        for size in (10, 100, 1000):
+            data = factory(size)
+            repeat = max(1, args.repeat * 10 // size)
+            default_time = timeit.timeit(lambda: default(data), number=repeat) / repeat
+            fast_time = timeit.timeit(lambda: fast_path(data), number=repeat) / repeat
+            print(f"{name:<8} {size:>6} {default_time * 1e6:>12.1f} {fast_time * 1e6:>10.1f} "
+                  f"{default_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
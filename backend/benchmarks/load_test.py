@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+FlowArt API load test
+
+Generates a synthetic artist directory, then drives each endpoint with many
+concurrent async clients and reports throughput and p50/p95/p99 latency.
+
+Targets:
+  * in-process (default): the FastAPI app is driven through httpx's ASGI
+    transport against MONGO_URL/DB_NAME, or against an in-memory Motor
+    stand-in with --mock (pip install -r requirements-bench.txt; it has no
+    $text support, so the search scenario is skipped there)
+  * --url http://localhost:8001: a running uvicorn server; synthetic data
+    and the consistency checks still go through MONGO_URL/DB_NAME, which
+    must point at that server's database
+
+Usage (from backend/):
+    python -m benchmarks.load_test --artists 5000 --concurrency 50 --requests 1000
+    python -m benchmarks.load_test --mock --output run.json --compare baseline.json
+
+Results are written as JSON so runs can be compared with --compare.
+
+The "like" scenario has every synthetic artist like one shared post
+concurrently, then checks that the post's like counter equals the number of
+like edges. Run it with POST_COUNTER_BUFFER unset and set, and compare the
+two, to see the cost of contention on one hot document. Against --url the
+tokens for it are minted locally, so SECRET_KEY must match the server's.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from bson import ObjectId
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+MEDIUMS = ["Digital", "Canvas", "Sculpture"]
+EXPERIENCES = ["Emerging", "Mid-Career", "Professional"]
+FIRST_NAMES = ["Elena", "Marcus", "Aisha", "Sophie", "Jamal", "Yuki", "Isabella", "David", "Olivia", "Rafael"]
+LAST_NAMES = ["Rodriguez", "Chen", "Patel", "Laurent", "Washington", "Tanaka", "Santos", "Kim", "Moore", "Martinez"]
+BIO_WORDS = ["abstract", "digital", "sculpture", "canvas", "light", "nature", "urban", "memory", "color", "form",
+             "installation", "ceramic", "generative", "portrait", "landscape", "texture", "motion", "identity"]
+
+BENCH_PASSWORD = "bench-password"
+
+# Scenarios the --mock database cannot serve (no $text search)
+MOCK_UNSUPPORTED = {"search"}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, errors, elapsed):
+    if not latencies:
+        return {"count": 0, "errors": errors}
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def synthetic_artists(count, run_id, rng):
+    """Profile data for ``count`` artists, without passwords"""
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "name": f"{first} {last}",
+            "username": f"bench_{run_id}_{i}",
+            "email": f"bench-{run_id}-{i}@flowart.bench",
+            "bio": " ".join(rng.choice(BIO_WORDS) for _ in range(12)).capitalize() + ".",
+            "location": rng.choice(["Berlin", "Kyoto", "Mumbai", "Paris", "Brooklyn", "São Paulo"]),
+            "medium": rng.choice(MEDIUMS),
+            "experience": rng.choice(EXPERIENCES),
+            "verified": rng.random() < 0.2,
+            "followers": int(rng.paretovariate(1.2) * 100),
+        }
+
+
+async def populate(db, count, run_id, rng, batch_size=1000):
+    """Insert synthetic artists directly, hashing the shared password once"""
+    from seed_data import prepare_user_document
+    from utils.auth import get_password_hash
+
+    hashed = get_password_hash(BENCH_PASSWORD)
+    ids, batch = [], []
+    for profile in synthetic_artists(count, run_id, rng):
+        batch.append(prepare_user_document(profile, hashed))
+        if len(batch) >= batch_size:
+            ids += (await db.users.insert_many(batch, ordered=False)).inserted_ids
+            batch = []
+    if batch:
+        ids += (await db.users.insert_many(batch, ordered=False)).inserted_ids
+    return [str(i) for i in ids]
+
+
+async def run_scenario(client, name, make_request, total, concurrency):
+    """Issue ``total`` requests from ``concurrency`` workers; returns the summary"""
+    latencies, errors = [], 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < total:
+            i = issued
+            issued += 1
+            method, url, kwargs = make_request(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, errors, time.perf_counter() - started)
+    if result["count"]:
+        print(f"  {name:<12} {result['count']:>6} ok {errors:>5} err {result['throughput_rps']:>9.1f} req/s  "
+              f"p50 {result['p50_ms']:>7.1f}ms  p95 {result['p95_ms']:>7.1f}ms  p99 {result['p99_ms']:>7.1f}ms")
+    else:
+        print(f"  {name:<12} all {errors} requests failed")
+    return result
+
+
+def build_scenarios(args, run_id, user_ids, token, rng, hot_post_id, like_tokens):
+    auth = {"Authorization": f"Bearer {token}"}
+    login_emails = [f"bench-{run_id}-{i}@flowart.bench" for i in range(min(len(user_ids), 100))]
+    search_terms = [rng.choice(FIRST_NAMES)[:rng.randint(2, 6)] for _ in range(50)] + BIO_WORDS
+
+    return [
+        ("register", args.auth_requests, lambda i: ("POST", "/api/auth/register", {"json": {
+            "name": "Load Tester", "email": f"bench-{run_id}-reg{i}@flowart.bench", "password": BENCH_PASSWORD}})),
+        ("login", args.auth_requests, lambda i: ("POST", "/api/auth/login", {"json": {
+            "email": login_emails[i % len(login_emails)], "password": BENCH_PASSWORD}})),
+        ("me", args.requests, lambda i: ("GET", "/api/auth/me", {"headers": auth})),
+        ("list", args.requests, lambda i: ("GET", "/api/users", {"params": {
+            "medium": rng.choice(MEDIUMS + ["All"]), "experience": rng.choice(EXPERIENCES + ["All"]), "limit": 24}})),
+        ("search", args.requests, lambda i: ("GET", "/api/users", {"params": {
+            "search": search_terms[i % len(search_terms)], "limit": 24}})),
+        ("get_by_id", args.requests, lambda i: ("GET", f"/api/users/{user_ids[i % len(user_ids)]}", {})),
+        ("status_write", args.requests, lambda i: ("POST", "/api/status", {"json": {"client_name": f"bench-{run_id}"}})),
+        ("status_read", args.requests, lambda i: ("GET", "/api/status", {})),
+        ("like", args.requests, lambda i: ("PUT", f"/api/posts/{hot_post_id}/like", {"headers": {
+            "Authorization": f"Bearer {like_tokens[i % len(like_tokens)]}"}})),
+    ]
+
+
+async def check_like_counter(client, db, post_id):
+    """Compare the hot post's like counter with its like edges"""
+    # Buffered counters reach the database within one flush interval
+    await asyncio.sleep(0.5)
+    response = await client.get(f"/api/posts/{post_id}")
+    response.raise_for_status()
+    counter = response.json()["likes"]
+    edges = await db.post_likes.count_documents({"postId": ObjectId(post_id)})
+    verdict = "consistent" if counter == edges else "LOST UPDATES"
+    print(f"  like counter {counter}, like edges {edges}: {verdict}")
+    return {"counter": counter, "edges": edges}
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nCompared with {baseline_path}:")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or not before.get("count") or not result.get("count"):
+            continue
+        print(f"  {name:<12} req/s {before['throughput_rps']:>9.1f} -> {result['throughput_rps']:>9.1f}   "
+              f"p95 {before['p95_ms']:>7.1f}ms -> {result['p95_ms']:>7.1f}ms   "
+              f"p99 {before['p99_ms']:>7.1f}ms -> {result['p99_ms']:>7.1f}ms")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+async def main(args):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+
+    if args.mock:
+        import motor.motor_asyncio
+        from mongomock_motor import AsyncMongoMockClient
+        motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+        os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+        os.environ.setdefault("DB_NAME", "flowart_bench")
+
+    from server import app
+    from utils.database import database
+
+    # Synthetic data always goes straight into the database the app uses
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        lifespan = None
+        db = database.connect()
+        await database.warmup()
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                                   base_url="http://bench", timeout=60)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        db = app.state.db
+    print(f"Populating {args.artists} synthetic artists (run {run_id})...")
+    user_ids = await populate(db, args.artists, run_id, rng)
+
+    results = {}
+    hot_post_id = None
+    try:
+        async with client:
+            response = await client.post("/api/auth/login", json={
+                "email": f"bench-{run_id}-0@flowart.bench", "password": BENCH_PASSWORD})
+            response.raise_for_status()
+            token = response.json()["access_token"]
+
+            # One post for every artist to like at once
+            from utils.auth import create_access_token
+            response = await client.post("/api/posts", headers={"Authorization": f"Bearer {token}"}, json={
+                "type": "Project Update", "title": f"Load test {run_id}", "content": "Hot post", "tags": [f"bench-{run_id}"]})
+            response.raise_for_status()
+            hot_post_id = response.json()["id"]
+            like_tokens = [create_access_token(data={"sub": user_id}) for user_id in user_ids]
+
+            print(f"Running with concurrency {args.concurrency}:")
+            scenarios = build_scenarios(args, run_id, user_ids, token, rng, hot_post_id, like_tokens)
+            for name, total, make_request in scenarios:
+                if args.only and name not in args.only.split(","):
+                    continue
+                if args.mock and name in MOCK_UNSUPPORTED:
+                    print(f"  {name:<12} skipped: not supported with --mock")
+                    results[name] = {"skipped": "not supported with --mock"}
+                    continue
+                results[name] = await run_scenario(client, name, make_request, total, args.concurrency)
+                if name == "like":
+                    results[name]["consistency"] = await check_like_counter(client, db, hot_post_id)
+    finally:
+        if not args.keep:
+            await db.posts.delete_many({"title": f"Load test {run_id}"})
+            if hot_post_id:
+                await db.post_likes.delete_many({"postId": ObjectId(hot_post_id)})
+            await db.users.delete_many({"email": {"$regex": f"^bench-{run_id}-"}})
+            await db.status_checks.delete_many({"client_name": f"bench-{run_id}"})
+            await db.tag_stats.delete_many({"tag": f"bench-{run_id}"})
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        else:
+            database.close()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "revision": git_revision(),
+            "target": args.url or ("in-process (mock)" if args.mock else "in-process"),
+            "artists": args.artists,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "auth_requests": args.auth_requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    output = args.output or str(BACKEND_DIR / "benchmarks" / "results" / f"load-{run_id}.json")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--mock", action="store_true", help="use an in-memory Motor stand-in (mongomock-motor)")
+    parser.add_argument("--artists", type=int, default=1000, help="synthetic artists to generate")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per read/write scenario")
+    parser.add_argument("--auth-requests", type=int, default=100, help="requests for register/login (bcrypt-bound)")
+    parser.add_argument("--only", help="comma-separated scenarios to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic data")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
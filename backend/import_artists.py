@@ -0,0 +1,306 @@
+"""
+Bulk artist import
+
+Streams artist profiles from a CSV or JSONL file into the users collection:
+
+    python import_artists.py partners.csv
+    python import_artists.py partners.jsonl --batch-size 2000 --workers 8
+
+Recognised fields: name, email (required), username, password or
+password_hash, bio, avatar, coverImage, location, medium, experience,
+verified, and social links as a nested ``social`` object (JSONL) or
+instagram/twitter/website columns (CSV). Follower counts are not imported:
+they belong to the follow graph and start at 0 for new artists.
+
+Rows are upserted on email: new artists are inserted, existing ones get
+their profile fields updated while keeping their password, username and
+creation date. New artists' passwords are hashed in a process pool across all cores, and
+writes go out as unordered bulk batches. Progress is checkpointed after every
+batch, so an interrupted run picks up where it stopped when started again
+with the same arguments.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Before the utils imports: pool sizes and timeouts are read at import time
+load_dotenv()
+
+from routes.auth import generate_username
+from seed_data import prepare_user_document
+from utils.auth import get_password_hash
+from utils.database import database
+from utils.indexes import ensure_indexes
+from utils.search import search_fields
+
+PROFILE_FIELDS = ("name", "bio", "avatar", "coverImage", "location", "medium", "experience", "verified")
+SOCIAL_FIELDS = ("instagram", "twitter", "website")
+
+# Attempts at resolving username collisions for a row
+MAX_USERNAME_ATTEMPTS = 3
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """Yield (line number, raw row) without loading the file into memory.
+
+    A JSONL line that does not parse is yielded as None and counted as skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=1):
+                yield line_no, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield line_no, json.loads(line)
+                    except json.JSONDecodeError:
+                        yield line_no, None
+
+
+def normalize_row(row: dict) -> Optional[dict]:
+    """Map a raw CSV/JSONL row onto profile fields; None if it cannot be imported"""
+    if not isinstance(row, dict):
+        return None
+    email = (row.get("email") or "").strip().lower()
+    name = (row.get("name") or "").strip()
+    if not email or not name:
+        return None
+
+    profile = {field: row[field] for field in PROFILE_FIELDS if row.get(field) not in (None, "")}
+    profile["name"] = name
+    profile["email"] = email
+    if "verified" in profile and isinstance(profile["verified"], str):
+        profile["verified"] = profile["verified"].strip().lower() in ("1", "true", "yes")
+
+    social = row.get("social") if isinstance(row.get("social"), dict) else {}
+    social = {field: social.get(field) or row.get(field) or None for field in SOCIAL_FIELDS}
+    if any(social.values()):
+        profile["social"] = social
+
+    return {
+        "profile": profile,
+        "username": (row.get("username") or "").strip() or None,
+        "password": row.get("password") or None,
+        "password_hash": row.get("password_hash") or None,
+    }
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords; runs inside a worker process"""
+    return [get_password_hash(password) for password in passwords]
+
+
+async def find_existing(db, rows: List[dict]) -> Dict[str, str]:
+    """Stored usernames of the batch's emails that are already registered"""
+    emails = [row["profile"]["email"] for row in rows]
+    cursor = db.users.find({"email": {"$in": emails}}, {"_id": 0, "email": 1, "username": 1})
+    return {user["email"]: user["username"] async for user in cursor}
+
+
+async def hash_batch(pool: ProcessPoolExecutor, workers: int, rows: List[dict], existing: Dict[str, str]) -> List[Optional[str]]:
+    """Hash the passwords of new artists, spreading the batch across the pool.
+
+    Existing artists keep their password, so their rows are not hashed.
+    """
+    hashes: List[Optional[str]] = [row["password_hash"] for row in rows]
+    todo = [i for i, h in enumerate(hashes) if h is None and rows[i]["profile"]["email"] not in existing]
+    # Artists without a password get an unguessable one and sign in after a reset
+    passwords = [rows[i]["password"] or secrets.token_urlsafe(24) for i in todo]
+
+    loop = asyncio.get_running_loop()
+    chunk_size = max(1, -(-len(passwords) // workers))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    results = await asyncio.gather(*(loop.run_in_executor(pool, hash_passwords, chunk) for chunk in chunks))
+
+    for i, hashed in zip(todo, (h for chunk in results for h in chunk)):
+        hashes[i] = hashed
+    return hashes
+
+
+def build_upsert(row: dict, hashed_password: Optional[str], stored_username: Optional[str]) -> UpdateOne:
+    """Upsert on email: profile fields always, identity fields only on insert.
+
+    ``stored_username`` is set for artists that already exist; they are
+    updated in place and their search prefixes rebuilt from the username they
+    actually have.
+    """
+    email = row["profile"]["email"]
+    on_update = {field: value for field, value in row["profile"].items() if field != "email"}
+    on_update["updatedAt"] = datetime.utcnow()
+
+    if stored_username is not None:
+        on_update.update(search_fields({"name": on_update["name"], "username": stored_username}))
+        return UpdateOne({"email": email}, {"$set": on_update})
+
+    username = row["username"] or generate_username(row["profile"]["name"])
+    user_doc = prepare_user_document({**row["profile"], "username": username}, hashed_password)
+    # Prefixes follow the username, which only this insert decides; an upsert
+    # that matches an artist created meanwhile leaves theirs alone
+    on_insert = {k: v for k, v in user_doc.items() if k not in on_update}
+    return UpdateOne({"email": email}, {"$set": on_update, "$setOnInsert": on_insert}, upsert=True)
+
+
+async def write_batch(db, rows: List[dict], hashes: List[Optional[str]], existing: Dict[str, str]) -> Dict[str, int]:
+    """Unordered bulk upsert; username collisions are retried with a new suffix"""
+    stats = {"inserted": 0, "updated": 0, "failed": 0}
+    pending = list(zip(rows, hashes))
+
+    for attempt in range(MAX_USERNAME_ATTEMPTS):
+        if not pending:
+            break
+        if attempt:
+            # Rows that lost an insert race on their email exist by now
+            existing = {**existing, **await find_existing(db, [row for row, _ in pending])}
+        requests = [build_upsert(row, hashed, existing.get(row["profile"]["email"])) for row, hashed in pending]
+        try:
+            result = await db.users.bulk_write(requests, ordered=False)
+            details = result.bulk_api_result
+            errors = []
+        except BulkWriteError as e:
+            details = e.details
+            errors = details.get("writeErrors", [])
+
+        stats["inserted"] += details.get("nUpserted", 0)
+        stats["updated"] += details.get("nMatched", 0)
+
+        retry = []
+        for error in errors:
+            row, hashed = pending[error["index"]]
+            # keyPattern on MongoDB 4.2+, otherwise the index name in errmsg
+            key = error.get("keyPattern") or error.get("errmsg", "")
+            if error.get("code") == 11000 and "username" in key:
+                # Fall back to a generated username for the next attempt
+                row = {**row, "username": None}
+                retry.append((row, hashed))
+            elif error.get("code") == 11000 and "email" in key:
+                # Lost an upsert race on the same email; simply retry
+                retry.append((row, hashed))
+            else:
+                stats["failed"] += 1
+                print(f"  ✗ {row['profile']['email']}: {error.get('errmsg')}")
+        pending = retry
+
+    for row, _ in pending:
+        stats["failed"] += 1
+        print(f"  ✗ {row['profile']['email']}: could not find a free username")
+    return stats
+
+
+def load_checkpoint(path: str, input_path: str) -> int:
+    """Last input line that was committed by a previous run"""
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("input") != os.path.abspath(input_path):
+        return 0
+    return checkpoint.get("line", 0)
+
+
+def save_checkpoint(path: str, input_path: str, line_no: int, totals: Dict[str, int]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "input": os.path.abspath(input_path),
+            "line": line_no,
+            "totals": totals,
+            "savedAt": datetime.utcnow().isoformat(),
+        }, f)
+    os.replace(tmp_path, path)
+
+
+async def import_artists(input_path: str, fmt: str, batch_size: int, workers: int, checkpoint_path: str):
+    """Run the import on the process-wide database client"""
+    async with database.session() as db:
+        await run_import(db, input_path, fmt, batch_size, workers, checkpoint_path)
+
+
+async def run_import(db, input_path: str, fmt: str, batch_size: int, workers: int, checkpoint_path: str):
+    """Stream, hash and upsert artists, checkpointing after every batch"""
+    # Upserts on email rely on the unique index
+    await ensure_indexes(db)
+
+    start_line = load_checkpoint(checkpoint_path, input_path)
+    if start_line:
+        print(f"Resuming after line {start_line}")
+
+    totals = {"inserted": 0, "updated": 0, "failed": 0, "skipped": 0}
+    started = time.perf_counter()
+
+    async def commit(rows, hashes, existing, last_line):
+        stats = await write_batch(db, rows, hashes, existing)
+        for key, value in stats.items():
+            totals[key] += value
+        save_checkpoint(checkpoint_path, input_path, last_line, totals)
+        rate = (totals["inserted"] + totals["updated"]) / (time.perf_counter() - started)
+        print(f"  line {last_line}: {totals['inserted']} inserted, {totals['updated']} updated, "
+              f"{totals['failed']} failed ({rate:.0f} rows/s)")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending_write = None
+        batch, last_line = [], start_line
+
+        async def flush(batch, last_line):
+            nonlocal pending_write
+            # Hash this batch while the previous one is being written
+            existing = await find_existing(db, batch)
+            hashes = await hash_batch(pool, workers, batch, existing)
+            if pending_write is not None:
+                await pending_write
+            pending_write = asyncio.create_task(commit(batch, hashes, existing, last_line))
+
+        for line_no, raw in read_rows(input_path, fmt):
+            if line_no <= start_line:
+                continue
+            row = normalize_row(raw)
+            last_line = line_no
+            if row is None:
+                totals["skipped"] += 1
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await flush(batch, last_line)
+                batch = []
+
+        if batch:
+            await flush(batch, last_line)
+        if pending_write is not None:
+            await pending_write
+        elif last_line > start_line:
+            save_checkpoint(checkpoint_path, input_path, last_line, totals)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Imported {totals['inserted']} new and {totals['updated']} existing artists "
+          f"in {elapsed:.1f}s ({totals['failed']} failed, {totals['skipped']} skipped rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="password hashing processes")
+    parser.add_argument("--checkpoint", help="defaults to <input>.checkpoint")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    checkpoint_path = args.checkpoint or f"{args.input}.checkpoint"
+    asyncio.run(import_artists(args.input, fmt, args.batch_size, args.workers, checkpoint_path))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+# User fields copied onto each artwork so a gallery page renders from one query
+ARTIST_SUMMARY_FIELDS = ("name", "username", "avatar", "verified")
+
+class ArtistSummary(BaseModel):
+    id: str
+    name: str
+    username: str
+    avatar: Optional[str] = None
+    verified: bool = False
+
+class ArtworkCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    image: str
+    medium: str
+    year: Optional[int] = Field(None, ge=0, le=9999)
+
+class ArtworkResponse(BaseModel):
+    id: str
+    title: str
+    image: str
+    medium: str
+    year: Optional[int] = None
+    likes: int = 0
+    artistId: str
+    artist: ArtistSummary
+    createdAt: datetime
+
+def artist_summary(user: dict) -> dict:
+    """Denormalized artist fields stored on artwork documents"""
+    return {field: user.get(field) for field in ARTIST_SUMMARY_FIELDS}
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Dict
+
+class ImageResponse(BaseModel):
+    id: str
+    width: int
+    height: int
+    # derivative name -> format -> URL, e.g. urls["card"]["webp"]
+    urls: Dict[str, Dict[str, str]]
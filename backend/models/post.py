@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal
+from datetime import datetime
+
+from models.artwork import ArtistSummary
+
+POST_TYPES = ("Open Call", "Project Update")
+MAX_TAGS = 10
+
+class PostCreate(BaseModel):
+    type: Literal[POST_TYPES]
+    title: str = Field(..., min_length=1, max_length=200)
+    content: str = Field(..., min_length=1, max_length=10000)
+    tags: List[str] = Field(default_factory=list)
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, tags: List[str]) -> List[str]:
+        # Trimmed, de-duplicated in order, and bounded for the multikey index
+        seen = []
+        for tag in (t.strip() for t in tags):
+            if tag and tag not in seen:
+                if len(tag) > 40:
+                    raise ValueError("Tags are limited to 40 characters")
+                seen.append(tag)
+        if len(seen) > MAX_TAGS:
+            raise ValueError(f"Posts are limited to {MAX_TAGS} tags")
+        return seen
+
+class PostResponse(BaseModel):
+    id: str
+    type: str
+    title: str
+    content: str
+    tags: List[str]
+    likes: int = 0
+    comments: int = 0
+    authorId: str
+    author: ArtistSummary
+    createdAt: datetime
+
+class CommentCreate(BaseModel):
+    content: str = Field(..., min_length=1, max_length=2000)
+
+class CommentResponse(BaseModel):
+    id: str
+    postId: str
+    authorId: str
+    author: ArtistSummary
+    content: str
+    createdAt: datetime
+
+class LikeResponse(BaseModel):
+    liked: bool
+    likes: int
+
+class TrendingTag(BaseModel):
+    tag: str
+    count: int
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime, timezone
+import uuid
+
+class StatusCheck(BaseModel):
+    model_config = ConfigDict(extra="ignore")  # Ignore MongoDB's _id field
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_name: str
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class StatusCheckCreate(BaseModel):
+    client_name: str
+
+class StatusBucket(BaseModel):
+    client_name: str
+    bucket: datetime
+    count: int
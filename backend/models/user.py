@@ -1,8 +1,25 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, Dict
+from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import Optional, Dict, List, Union
 from datetime import datetime
 from bson import ObjectId
 
+# Fields that are stored on user documents but never returned by the API
+USER_PUBLIC_PROJECTION = {"password": 0, "searchPrefixes": 0}
+
+# Fields clients may request from the directory with ?fields=. Email is
+# deliberately not selectable.
+USER_SELECTABLE_FIELDS = (
+    "id", "name", "username", "bio", "avatar", "coverImage", "location", "medium",
+    "experience", "social", "verified", "followers", "following", "createdAt", "updatedAt",
+)
+
+# Named directory views (?view=); "full" is the default public projection
+USER_VIEWS = {
+    # Everything NexusCard renders
+    "card": ("id", "name", "username", "bio", "avatar", "coverImage", "location", "medium",
+             "experience", "social", "verified", "followers"),
+}
+
 class PyObjectId(str):
     @classmethod
     def __get_validators__(cls):
@@ -32,6 +49,7 @@ class UserBase(BaseModel):
     social: Optional[SocialLinks] = Field(default_factory=SocialLinks)
     verified: bool = False
     followers: int = 0
+    following: int = 0
 
 class UserCreate(BaseModel):
     name: str
@@ -39,6 +57,12 @@ class UserCreate(BaseModel):
     password: str
     username: Optional[str] = None
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        # Stored lowercase so the unique index is case-insensitive in effect
+        return email.lower()
+
 class UserUpdate(BaseModel):
     bio: Optional[str] = None
     location: Optional[str] = None
@@ -66,9 +90,31 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class FacetCount(BaseModel):
+    value: Optional[Union[str, bool]] = None
+    count: int
+
+class UserFacets(BaseModel):
+    total: int
+    medium: List[FacetCount]
+    experience: List[FacetCount]
+    verified: List[FacetCount]
+
+class FollowResponse(BaseModel):
+    following: bool
+    followers: int
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None
@@ -76,3 +122,8 @@ class TokenData(BaseModel):
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        return email.lower()
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from typing import List, Optional
+from bson import ObjectId
+from datetime import datetime
+
+from models.artwork import ArtworkCreate, ArtworkResponse, artist_summary
+from utils.dependencies import get_current_user, get_current_user_id
+from utils.pagination import clamp_page_size, fetch_page
+from utils.serialization import FAST_SERIALIZATION, dumps
+
+router = APIRouter(prefix="/artworks", tags=["Artworks"])
+
+# Newest first; _id breaks ties between artworks created in the same millisecond
+ARTWORK_SORT = [("createdAt", -1), ("_id", -1)]
+
+def to_response(artwork: dict) -> dict:
+    """Shape a stored artwork for the API"""
+    artist_id = str(artwork.pop("artistId"))
+    artwork["id"] = str(artwork.pop("_id"))
+    artwork["artistId"] = artist_id
+    artwork["artist"] = {**artwork.get("artist", {}), "id": artist_id}
+    return artwork
+
+def build_artwork_query(artist_id: Optional[str], medium: Optional[str]) -> dict:
+    """Query document for the gallery feeds"""
+    query = {}
+    if artist_id:
+        if not ObjectId.is_valid(artist_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid artist ID"
+            )
+        query["artistId"] = ObjectId(artist_id)
+    if medium and medium != "All":
+        query["medium"] = medium
+    return query
+
+@router.get("", response_model=List[ArtworkResponse])
+async def get_artworks(
+    request: Request,
+    response: Response,
+    artist_id: Optional[str] = Query(None),
+    medium: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get a page of artworks, newest first.
+    
+    Without filters this is the recent feed; ``artist_id`` and ``medium``
+    give the per-artist and per-medium feeds. Each feed is backed by a
+    compound index ending in the sort key. Artist name, username, avatar
+    and verified status are stored on every artwork, so a page needs no
+    user lookups.
+    """
+    db = request.app.state.db
+    artworks, next_cursor = await fetch_page(
+        db.artworks,
+        build_artwork_query(artist_id, medium),
+        ARTWORK_SORT,
+        clamp_page_size(limit),
+        cursor=cursor
+    )
+    artworks = [to_response(artwork) for artwork in artworks]
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if FAST_SERIALIZATION:
+        return Response(content=dumps(artworks), media_type="application/json", headers=headers)
+    
+    response.headers.update(headers)
+    return artworks
+
+@router.post("", response_model=ArtworkResponse, status_code=status.HTTP_201_CREATED)
+async def create_artwork(
+    artwork_data: ArtworkCreate,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """Publish an artwork as the authenticated artist"""
+    db = request.app.state.db
+    now = datetime.utcnow()
+    artwork = {
+        **artwork_data.model_dump(),
+        "likes": 0,
+        "artistId": current_user["_id"],
+        "artist": artist_summary(current_user),
+        "createdAt": now,
+        "updatedAt": now
+    }
+    
+    await db.artworks.insert_one(artwork)
+    return to_response(artwork)
+
+@router.get("/{artwork_id}", response_model=ArtworkResponse)
+async def get_artwork(artwork_id: str, request: Request):
+    """Get a specific artwork by ID"""
+    db = request.app.state.db
+    if not ObjectId.is_valid(artwork_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid artwork ID"
+        )
+    
+    artwork = await db.artworks.find_one({"_id": ObjectId(artwork_id)})
+    if not artwork:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Artwork not found"
+        )
+    return to_response(artwork)
+
+@router.delete("/{artwork_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_artwork(
+    artwork_id: str,
+    request: Request,
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Delete one of the authenticated artist's artworks"""
+    db = request.app.state.db
+    if not ObjectId.is_valid(artwork_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid artwork ID"
+        )
+    
+    # Ownership is part of the filter, so checking and deleting is one operation
+    result = await db.artworks.delete_one({"_id": ObjectId(artwork_id), "artistId": ObjectId(current_user_id)})
+    if result.deleted_count == 0:
+        exists = await db.artworks.find_one({"_id": ObjectId(artwork_id)}, {"_id": 1})
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN if exists else status.HTTP_404_NOT_FOUND,
+            detail="Not authorized to delete this artwork" if exists else "Artwork not found"
+        )
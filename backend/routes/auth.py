@@ -2,49 +2,69 @@ from fastapi import APIRouter, HTTPException, status, Depends, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from typing import Optional
+import logging
+import random
 import re
 
-from models.user import UserCreate, UserResponse, Token, LoginRequest
-from utils.auth import verify_password, get_password_hash, create_access_token
-from utils.dependencies import get_current_user, security
+from models.user import UserCreate, UserResponse, Token, LoginRequest, RefreshRequest, LogoutRequest
+from utils.auth import verify_password_async, get_password_hash_async, create_token_pair, decode_token
+from utils.dependencies import get_current_user, get_token_payload
+from utils.revocation import revocation_list
+from utils.search import search_fields
+from utils.cache import invalidate_user
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
- 
+# Attempts at finding a free username before giving up
+MAX_USERNAME_ATTEMPTS = 5
 
 def generate_username(name: str) -> str:
     """Generate a username from name"""
     # Remove special characters and convert to lowercase
     username = re.sub(r'[^a-zA-Z0-9]', '', name.lower())
     # Add random suffix
-    import random
     suffix = random.randint(100, 999)
     return f"{username}_{suffix}"
 
+def duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+    """Name of the unique field that caused a duplicate key error"""
+    details = error.details or {}
+    key_pattern = details.get("keyPattern") or details.get("keyValue")
+    if key_pattern:
+        return next(iter(key_pattern))
+    # Servers before 4.2 only report the index name in the message
+    match = re.search(r"index: (\w+?)_-?1 ", details.get("errmsg") or str(error))
+    return match.group(1) if match else None
+
+async def migrate_email_case(db) -> int:
+    """Lowercase emails stored before sign-up and login normalized them"""
+    migrated = 0
+    async for user in db.users.find({"email": {"$regex": "[A-Z]"}}, {"email": 1}):
+        email = user["email"].lower()
+        try:
+            result = await db.users.update_one({"_id": user["_id"]}, {"$set": {"email": email}})
+        except DuplicateKeyError:
+            # Two accounts differing only in case; leave both for a human
+            logger.warning("Cannot lowercase email of user %s: %s is already registered", user["_id"], email)
+            continue
+        migrated += result.modified_count
+    return migrated
+
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, request: Request):
     """Register a new user"""
     db = request.app.state.db
-    # Check if email already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
     
     # Generate username if not provided
-    username = user_data.username or generate_username(user_data.name)
-    
-    # Check if username exists
-    existing_username = await db.users.find_one({"username": username})
-    if existing_username:
-        # Add random suffix if username exists
-        import random
-        username = f"{username}_{random.randint(1000, 9999)}"
+    base_username = user_data.username or generate_username(user_data.name)
+    username = base_username
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     # Create user document
     user_doc = {
@@ -65,27 +85,49 @@ async def register(user_data: UserCreate, request: Request):
         },
         "verified": False,
         "followers": 0,
+        "following": 0,
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow()
     }
     
-    # Insert user
-    result = await db.users.insert_one(user_doc)
-    user_id = str(result.inserted_id)
+    # Insert user; the unique email and username indexes reject duplicates,
+    # so there is no pre-read and no window for two sign-ups to race.
+    for _ in range(MAX_USERNAME_ATTEMPTS):
+        user_doc["username"] = username
+        user_doc.update(search_fields(user_doc))
+        try:
+            result = await db.users.insert_one(user_doc)
+            break
+        except DuplicateKeyError as e:
+            field = duplicate_key_field(e)
+            if field == "email":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already registered"
+                )
+            if field != "username":
+                raise
+            # Username taken: retry with a new suffix
+            if user_data.username:
+                username = f"{base_username}_{random.randint(1000, 9999)}"
+            else:
+                username = generate_username(user_data.name)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already taken"
+        )
     
-    # Create access token
-    access_token = create_access_token(data={"sub": user_id})
+    user_id = str(result.inserted_id)
+    invalidate_user()
     
-    # Return user and token
+    # Return user and tokens
     user_doc["id"] = user_id
     user_doc.pop("password")
+    user_doc.pop("searchPrefixes")
     user_doc.pop("_id", None)
     
-    return {
-        "user": user_doc,
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return {"user": user_doc, **create_token_pair(user_id)}
 
 @router.post("/login", response_model=dict)
 async def login(login_data: LoginRequest, request: Request):
@@ -100,47 +142,73 @@ async def login(login_data: LoginRequest, request: Request):
         )
     
     # Verify password
-    if not verify_password(login_data.password, user["password"]):
+    if not await verify_password_async(login_data.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    # Create access token
+    # Return user and tokens
     user_id = str(user["_id"])
-    access_token = create_access_token(data={"sub": user_id})
-    
-    # Return user and token
     user["id"] = user_id
     user.pop("password")
+    user.pop("searchPrefixes", None)
     user.pop("_id")
     
-    return {
-        "user": user,
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return {"user": user, **create_token_pair(user_id)}
+
+@router.post("/refresh", response_model=Token)
+async def refresh(refresh_data: RefreshRequest, request: Request):
+    """Exchange a refresh token for a new access and refresh token.
+
+    Refresh tokens are single-use: the presented token is revoked as part
+    of the exchange, and presenting it again fails. Tokens of users that no
+    longer exist are rejected.
+    """
+    db = request.app.state.db
+    payload = decode_token(refresh_data.refresh_token, "refresh")
+    if payload is None or not ObjectId.is_valid(payload["sub"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    # Tokens outlive accounts; only issue new ones for users that still exist
+    if await db.users.find_one({"_id": ObjectId(payload["sub"])}, {"_id": 1}) is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    # The revocation insert is keyed on the jti, so of two concurrent
+    # exchanges of the same token only one succeeds
+    if not await revocation_list.revoke(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    return create_token_pair(payload["sub"])
 
-# async def get_current_user_with_db(credentials = Depends(security), request: Request = None):
-#     """Get current user with database dependency"""
-#     if request:
-#         db = request.app.state.db
-#     else:
-#         # Fallback to creating connection
-#         from motor.motor_asyncio import AsyncIOMotorClient
-#         import os
-#         mongo_url = os.environ['MONGO_URL']
-#         client = AsyncIOMotorClient(mongo_url)
-#         db = client[os.environ['DB_NAME']]
-#     return await get_current_user(credentials, db)
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Request,
+    logout_data: Optional[LogoutRequest] = None,
+    payload: dict = Depends(get_token_payload)
+):
+    """Revoke the presented access token and, if given, the refresh token"""
+    db = request.app.state.db
+    await revocation_list.revoke(db, payload)
+    
+    if logout_data and logout_data.refresh_token:
+        refresh_payload = decode_token(logout_data.refresh_token, "refresh")
+        if refresh_payload is not None and refresh_payload["sub"] == payload["sub"]:
+            await revocation_list.revoke(db, refresh_payload)
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_route(request: Request, credentials = Depends(security)):
+async def get_current_user_route(current_user = Depends(get_current_user)):
     """Get current authenticated user"""
-    db = request.app.state.db
-    current_user = await get_current_user(credentials, db)
-    user = current_user.copy()
+    user = current_user
     user["id"] = str(user["_id"])
-    user.pop("password")
     user.pop("_id")
     return user
@@ -0,0 +1,183 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from typing import Dict, List, Optional
+from bson import ObjectId
+import logging
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from models.user import FollowResponse, USER_VIEWS
+from utils.cache import directory_cache, user_cache
+from utils.dependencies import get_current_user, get_current_user_id
+from utils.follows import repair_follow_counts
+from utils.ids import parse_object_id
+from utils.pagination import MAX_PAGE_SIZE, clamp_page_size, fetch_page
+from utils.selection import selection_projection, to_response
+from utils.serialization import FAST_SERIALIZATION, dumps
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/users", tags=["Follows"])
+
+# Most recent follows first; _id breaks ties
+FOLLOW_SORT = [("createdAt", -1), ("_id", -1)]
+# Follower and following lists render as directory cards
+FOLLOW_VIEW = USER_VIEWS["card"]
+
+async def adjust_counts(db, follower_id: ObjectId, followee_id: ObjectId, delta: int) -> Optional[int]:
+    """Apply one edge change to both users' counters; returns the new follower count.
+    
+    updatedAt moves with the counters, so profile ETags and Last-Modified
+    change with them. The edge and the two counters are separate writes: if
+    a counter update fails, both users are recounted from their edges
+    instead. Drift left by a crash in between is repaired by
+    ``seed_data.py --reconcile-follows``.
+    """
+    now = datetime.utcnow()
+    followee = None
+    try:
+        followee = await db.users.find_one_and_update(
+            {"_id": followee_id},
+            {"$inc": {"followers": delta}, "$set": {"updatedAt": now}},
+            projection={"followers": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        await db.users.update_one({"_id": follower_id}, {"$inc": {"following": delta}, "$set": {"updatedAt": now}})
+    except PyMongoError:
+        # Either counter may or may not have moved; the edges are the truth
+        logger.exception("Follow counter update failed; recounting %s and %s", follower_id, followee_id)
+        await repair_follow_counts(db, [follower_id, followee_id])
+        followee = None
+    finally:
+        user_cache.invalidate(str(followee_id))
+        user_cache.invalidate(str(follower_id))
+        # The directory is sorted and paginated on followers, so cached pages
+        # would show stale counts and order
+        directory_cache.clear()
+    return followee["followers"] if followee else None
+
+async def follower_count(db, user_id: ObjectId, known: Optional[int]) -> int:
+    if known is not None:
+        return known
+    user = await db.users.find_one({"_id": user_id}, {"followers": 1})
+    return (user or {}).get("followers", 0)
+
+async def user_page(db, query: dict, user_field: str, limit: int, cursor: Optional[str]):
+    """One page of follow edges, resolved to user cards in edge order"""
+    edges, next_cursor = await fetch_page(
+        db.follows,
+        query,
+        FOLLOW_SORT,
+        limit,
+        cursor=cursor,
+        projection={user_field: 1, "createdAt": 1}
+    )
+    ids = [edge[user_field] for edge in edges]
+    users = await db.users.find({"_id": {"$in": ids}}, selection_projection(FOLLOW_VIEW)).to_list(length=len(ids))
+    by_id = {user["_id"]: user for user in users}
+    return [to_response(by_id[user_id], FOLLOW_VIEW) for user_id in ids if user_id in by_id], next_cursor
+
+def page_response(users: List[dict], next_cursor: Optional[str], response: Response):
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if FAST_SERIALIZATION:
+        return Response(content=dumps(users), media_type="application/json", headers=headers)
+    
+    response.headers.update(headers)
+    return users
+
+@router.put("/{user_id}/follow", response_model=FollowResponse)
+async def follow_user(user_id: str, request: Request, current_user = Depends(get_current_user)):
+    """Follow a user. Idempotent: following twice counts once.
+    
+    The follow is an edge document under a unique (followerId, followeeId)
+    index; only the request that creates the edge increments the counters.
+    The follower is resolved like /api/auth/me, so a token outliving its
+    account cannot create edges.
+    """
+    db = request.app.state.db
+    followee_id = parse_object_id(user_id, "user")
+    follower_id = current_user["_id"]
+    if followee_id == follower_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot follow yourself"
+        )
+    if await db.users.find_one({"_id": followee_id}, {"_id": 1}) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    followers = None
+    try:
+        await db.follows.insert_one({"followerId": follower_id, "followeeId": followee_id, "createdAt": datetime.utcnow()})
+        followers = await adjust_counts(db, follower_id, followee_id, 1)
+    except DuplicateKeyError:
+        pass
+    return {"following": True, "followers": await follower_count(db, followee_id, followers)}
+
+@router.delete("/{user_id}/follow", response_model=FollowResponse)
+async def unfollow_user(user_id: str, request: Request, current_user_id: str = Depends(get_current_user_id)):
+    """Unfollow a user. Idempotent: only an existing follow decrements the counters."""
+    db = request.app.state.db
+    followee_id = parse_object_id(user_id, "user")
+    follower_id = ObjectId(current_user_id)
+    
+    followers = None
+    result = await db.follows.delete_one({"followerId": follower_id, "followeeId": followee_id})
+    if result.deleted_count:
+        followers = await adjust_counts(db, follower_id, followee_id, -1)
+    return {"following": False, "followers": await follower_count(db, followee_id, followers)}
+
+@router.get("/{user_id}/followers", response_model=List[dict])
+async def get_followers(
+    user_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get a page of a user's followers as directory cards, most recent first"""
+    db = request.app.state.db
+    query = {"followeeId": parse_object_id(user_id, "user")}
+    users, next_cursor = await user_page(db, query, "followerId", clamp_page_size(limit), cursor)
+    return page_response(users, next_cursor, response)
+
+@router.get("/{user_id}/following", response_model=List[dict])
+async def get_following(
+    user_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get a page of the users a user follows as directory cards, most recent first"""
+    db = request.app.state.db
+    query = {"followerId": parse_object_id(user_id, "user")}
+    users, next_cursor = await user_page(db, query, "followeeId", clamp_page_size(limit), cursor)
+    return page_response(users, next_cursor, response)
+
+@router.get("/{user_id}/follows", response_model=Dict[str, bool])
+async def check_follows(
+    user_id: str,
+    request: Request,
+    ids: str = Query(..., description="Comma-separated user IDs, e.g. the artists on a directory page")
+):
+    """Which of the given users ``user_id`` follows, in one indexed query"""
+    db = request.app.state.db
+    follower_id = parse_object_id(user_id, "user")
+    candidates = list(dict.fromkeys(value.strip() for value in ids.split(",") if value.strip()))
+    if len(candidates) > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_PAGE_SIZE} IDs per request"
+        )
+    followee_ids = [parse_object_id(value, "user") for value in candidates]
+    
+    # Covered by the unique (followerId, followeeId) index
+    edges = await db.follows.find(
+        {"followerId": follower_id, "followeeId": {"$in": followee_ids}},
+        {"_id": 0, "followeeId": 1}
+    ).to_list(length=len(followee_ids))
+    followed = {str(edge["followeeId"]) for edge in edges}
+    return {value: value in followed for value in candidates}
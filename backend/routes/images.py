@@ -0,0 +1,150 @@
+from fastapi import APIRouter, HTTPException, status, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse
+from typing import Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import asyncio
+import re
+
+from models.image import ImageResponse
+from models.user import USER_PUBLIC_PROJECTION
+from utils.cache import invalidate_user, user_cache
+from utils.dependencies import get_current_user_id
+from utils.etag import etag_matches
+from utils.images import DERIVATIVES, FORMATS, MAX_UPLOAD_BYTES, ImageTooLarge, content_hash, image_pool, render_derivatives
+from utils.storage import IMMUTABLE_CACHE_CONTROL, blob_store
+from utils.summaries import sync_user_summaries
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+# Profile fields an upload can be assigned to, and the derivative they use
+PROFILE_IMAGE_TARGETS = {
+    "avatar": "thumbnail",
+    "coverImage": "card",
+}
+
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+def derivative_key(digest: str, name: str, fmt: str) -> str:
+    return f"{digest}/{name}.{fmt}"
+
+def image_urls(digest: str) -> dict:
+    return {
+        name: {fmt: blob_store.url(derivative_key(digest, name, fmt)) for fmt in FORMATS}
+        for name in DERIVATIVES
+    }
+
+async def store_image(db, data: bytes, content_type: Optional[str], user_id: str) -> dict:
+    """Store an upload and its derivatives unless identical content exists"""
+    digest = content_hash(data)
+    record = await db.images.find_one({"_id": digest})
+    if record is not None:
+        return record
+    
+    try:
+        rendered = await image_pool.run(render_derivatives, data)
+    except ImageTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Blobs first: an images record implies every derivative is in place
+    await asyncio.gather(
+        blob_store.put(f"{digest}/original", data, content_type or "application/octet-stream"),
+        *(
+            blob_store.put(derivative_key(digest, name, fmt), blob, FORMATS[fmt][0])
+            for (name, fmt), blob in rendered["derivatives"].items()
+        )
+    )
+    
+    record = {
+        "_id": digest,
+        "width": rendered["width"],
+        "height": rendered["height"],
+        "size": len(data),
+        "contentType": content_type,
+        "uploadedBy": ObjectId(user_id),
+        "createdAt": datetime.utcnow()
+    }
+    try:
+        await db.images.insert_one(record)
+    except DuplicateKeyError:
+        # Same content uploaded concurrently; the blobs are identical
+        pass
+    return record
+
+@router.post("", response_model=ImageResponse, status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    request: Request,
+    file: UploadFile = File(...),
+    target: Optional[str] = Query(None, description="Also set the uploader's avatar or coverImage"),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Upload an image and get URLs for its resized derivatives.
+    
+    Thumbnail (160px), card (600px) and full (1600px) renditions are
+    produced as WebP and JPEG on the image process pool. Storage is keyed by
+    the SHA-256 of the upload, so uploading the same file again is free and
+    returns the same URLs. With ``target`` the matching derivative becomes
+    the user's avatar or cover image.
+    """
+    db = request.app.state.db
+    if target is not None and target not in PROFILE_IMAGE_TARGETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown target: {target}"
+        )
+    
+    data = await file.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Images are limited to {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+        )
+    
+    record = await store_image(db, data, file.content_type, current_user_id)
+    urls = image_urls(record["_id"])
+    
+    if target is not None:
+        update = {target: urls[PROFILE_IMAGE_TARGETS[target]]["webp"], "updatedAt": datetime.utcnow()}
+        updated_user = await db.users.find_one_and_update(
+            {"_id": ObjectId(current_user_id)},
+            {"$set": update},
+            projection=USER_PUBLIC_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+        invalidate_user(current_user_id)
+        if updated_user is not None:
+            user_cache.set(current_user_id, updated_user)
+            await sync_user_summaries(db, current_user_id, update)
+    
+    return {"id": record["_id"], "width": record["width"], "height": record["height"], "urls": urls}
+
+@router.get("/{digest}/{variant}", include_in_schema=False)
+async def get_image(digest: str, variant: str, request: Request):
+    """Serve a derivative from local storage with immutable cache headers"""
+    name, _, fmt = variant.partition(".")
+    path = None
+    if DIGEST_PATTERN.fullmatch(digest) and name in DERIVATIVES and fmt in FORMATS:
+        path = blob_store.local_path(derivative_key(digest, name, fmt))
+    if path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    
+    # The URL changes whenever the content does, so it is its own validator
+    etag = f'"{digest}-{name}-{fmt}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FileResponse(path, media_type=FORMATS[fmt][0], headers=headers)
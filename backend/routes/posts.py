@@ -0,0 +1,228 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from typing import List, Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from models.artwork import artist_summary
+from models.post import PostCreate, PostResponse, CommentCreate, CommentResponse, LikeResponse
+from utils.counters import post_counters
+from utils.dependencies import get_current_user, get_current_user_id
+from utils.ids import parse_object_id
+from utils.pagination import clamp_page_size, fetch_page
+from utils.serialization import FAST_SERIALIZATION, dumps
+from utils.trending import record_tags
+
+router = APIRouter(prefix="/posts", tags=["Community"])
+
+# Newest first; _id breaks ties between posts created in the same millisecond
+POST_SORT = [("createdAt", -1), ("_id", -1)]
+# Comments read oldest first, like a conversation
+COMMENT_SORT = [("createdAt", 1), ("_id", 1)]
+
+def to_response(post: dict) -> dict:
+    """Shape a stored post for the API, including counter updates not yet flushed"""
+    post_id = post.pop("_id")
+    post["id"] = str(post_id)
+    post["authorId"] = str(post["authorId"])
+    post["author"] = {**post.get("author", {}), "id": post["authorId"]}
+    post["likes"] = post.get("likes", 0) + post_counters.pending(post_id, "likes")
+    post["comments"] = post.get("comments", 0) + post_counters.pending(post_id, "comments")
+    return post
+
+def comment_to_response(comment: dict) -> dict:
+    comment["id"] = str(comment.pop("_id"))
+    comment["postId"] = str(comment["postId"])
+    comment["authorId"] = str(comment["authorId"])
+    comment["author"] = {**comment.get("author", {}), "id": comment["authorId"]}
+    return comment
+
+async def increment(db, post_id: ObjectId, field: str, delta: int) -> Optional[int]:
+    """Adjust a post counter; returns the new value when it is known.
+    
+    With POST_COUNTER_BUFFER the increment is aggregated in memory and
+    written by the counter buffer, otherwise it is a single atomic $inc.
+    """
+    if post_counters.running:
+        post_counters.add(post_id, field, delta)
+        return None
+    post = await db.posts.find_one_and_update(
+        {"_id": post_id},
+        {"$inc": {field: delta}},
+        projection={field: 1},
+        return_document=ReturnDocument.AFTER
+    )
+    return post[field] if post else None
+
+async def current_count(db, post_id: ObjectId, field: str, known: Optional[int]) -> int:
+    if known is not None:
+        return known
+    post = await db.posts.find_one({"_id": post_id}, {field: 1})
+    return (post or {}).get(field, 0) + post_counters.pending(post_id, field)
+
+async def require_post(db, post_id: ObjectId):
+    if await db.posts.find_one({"_id": post_id}, {"_id": 1}) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+
+@router.get("", response_model=List[PostResponse])
+async def get_posts(
+    request: Request,
+    response: Response,
+    type: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    author_id: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get a page of community posts, newest first, optionally by type, tag or author"""
+    db = request.app.state.db
+    query = {}
+    if type and type != "All":
+        query["type"] = type
+    if tag and tag != "All":
+        query["tags"] = tag
+    if author_id:
+        query["authorId"] = parse_object_id(author_id, "author")
+    
+    posts, next_cursor = await fetch_page(db.posts, query, POST_SORT, clamp_page_size(limit), cursor=cursor)
+    posts = [to_response(post) for post in posts]
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if FAST_SERIALIZATION:
+        return Response(content=dumps(posts), media_type="application/json", headers=headers)
+    
+    response.headers.update(headers)
+    return posts
+
+@router.post("", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
+async def create_post(post_data: PostCreate, request: Request, current_user = Depends(get_current_user)):
+    """Publish a community post as the authenticated user"""
+    db = request.app.state.db
+    now = datetime.utcnow()
+    post = {
+        **post_data.model_dump(),
+        "likes": 0,
+        "comments": 0,
+        "authorId": current_user["_id"],
+        "author": artist_summary(current_user),
+        "createdAt": now,
+        "updatedAt": now
+    }
+    
+    await db.posts.insert_one(post)
+    if post["tags"]:
+        await record_tags(db, post["tags"], now)
+    return to_response(post)
+
+@router.get("/{post_id}", response_model=PostResponse)
+async def get_post(post_id: str, request: Request):
+    """Get a specific post by ID"""
+    db = request.app.state.db
+    post = await db.posts.find_one({"_id": parse_object_id(post_id, "post")})
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return to_response(post)
+
+@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_post(post_id: str, request: Request, current_user_id: str = Depends(get_current_user_id)):
+    """Delete one of the authenticated user's posts with its likes and comments"""
+    db = request.app.state.db
+    oid = parse_object_id(post_id, "post")
+    
+    deleted = await db.posts.find_one_and_delete(
+        {"_id": oid, "authorId": ObjectId(current_user_id)},
+        projection={"tags": 1, "createdAt": 1}
+    )
+    if deleted is None:
+        exists = await db.posts.find_one({"_id": oid}, {"_id": 1})
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN if exists else status.HTTP_404_NOT_FOUND,
+            detail="Not authorized to delete this post" if exists else "Post not found"
+        )
+    
+    await db.post_likes.delete_many({"postId": oid})
+    await db.post_comments.delete_many({"postId": oid})
+    if deleted.get("tags"):
+        await record_tags(db, deleted["tags"], deleted["createdAt"], -1)
+
+@router.put("/{post_id}/like", response_model=LikeResponse)
+async def like_post(post_id: str, request: Request, current_user_id: str = Depends(get_current_user_id)):
+    """Like a post. Idempotent: liking twice counts once.
+    
+    The like is an edge document under a unique (postId, userId) index; only
+    the request that creates the edge increments the counter.
+    """
+    db = request.app.state.db
+    oid = parse_object_id(post_id, "post")
+    await require_post(db, oid)
+    
+    likes = None
+    try:
+        await db.post_likes.insert_one({"postId": oid, "userId": ObjectId(current_user_id), "createdAt": datetime.utcnow()})
+        likes = await increment(db, oid, "likes", 1)
+    except DuplicateKeyError:
+        pass
+    return {"liked": True, "likes": await current_count(db, oid, "likes", likes)}
+
+@router.delete("/{post_id}/like", response_model=LikeResponse)
+async def unlike_post(post_id: str, request: Request, current_user_id: str = Depends(get_current_user_id)):
+    """Remove a like. Idempotent: only an existing like decrements the counter."""
+    db = request.app.state.db
+    oid = parse_object_id(post_id, "post")
+    
+    likes = None
+    result = await db.post_likes.delete_one({"postId": oid, "userId": ObjectId(current_user_id)})
+    if result.deleted_count:
+        likes = await increment(db, oid, "likes", -1)
+    return {"liked": False, "likes": await current_count(db, oid, "likes", likes)}
+
+@router.get("/{post_id}/comments", response_model=List[CommentResponse])
+async def get_comments(
+    post_id: str,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get a page of a post's comments, oldest first"""
+    db = request.app.state.db
+    comments, next_cursor = await fetch_page(
+        db.post_comments,
+        {"postId": parse_object_id(post_id, "post")},
+        COMMENT_SORT,
+        clamp_page_size(limit),
+        cursor=cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [comment_to_response(comment) for comment in comments]
+
+@router.post("/{post_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
+async def create_comment(
+    post_id: str,
+    comment_data: CommentCreate,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """Comment on a post as the authenticated user"""
+    db = request.app.state.db
+    oid = parse_object_id(post_id, "post")
+    await require_post(db, oid)
+    
+    comment = {
+        "postId": oid,
+        "authorId": current_user["_id"],
+        "author": artist_summary(current_user),
+        "content": comment_data.content,
+        "createdAt": datetime.utcnow()
+    }
+    await db.post_comments.insert_one(comment)
+    await increment(db, oid, "comments", 1)
+    return comment_to_response(comment)
@@ -0,0 +1,147 @@
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
+from bson.codec_options import CodecOptions
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from models.status import StatusCheck, StatusCheckCreate, StatusBucket
+from utils.batch_writer import status_writer
+from utils.indexes import is_timeseries
+from utils.pagination import clamp_page_size, fetch_page
+from utils.serialization import FAST_SERIALIZATION, dumps
+
+router = APIRouter(prefix="/status", tags=["Status"])
+
+# Newest first; id breaks ties between checks in the same millisecond
+STATUS_SORT = [("timestamp", -1), ("id", -1)]
+DEFAULT_STATUS_PAGE_SIZE = 100
+MAX_STATUS_PAGE_SIZE = 1000
+
+# Aggregation: bucket sizes accepted by $dateTrunc, default window and row cap
+BUCKET_UNITS = ("minute", "hour", "day", "week", "month")
+DEFAULT_SUMMARY_WINDOW = timedelta(hours=24)
+MAX_SUMMARY_ROWS = 10000
+
+# tz_aware decodes to UTC by default
+_codec_options = CodecOptions(tz_aware=True)
+
+def status_collection(db):
+    """status_checks, decoding timestamps as aware UTC datetimes"""
+    return db.get_collection("status_checks", codec_options=_codec_options)
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive query datetimes as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def build_status_query(since: Optional[datetime], until: Optional[datetime], client_name: Optional[str]) -> dict:
+    """Query document for a time range (since inclusive, until exclusive)"""
+    query = {}
+    if client_name:
+        query["client_name"] = client_name
+    time_range = {}
+    if since:
+        time_range["$gte"] = as_utc(since)
+    if until:
+        time_range["$lt"] = as_utc(until)
+    if time_range:
+        query["timestamp"] = time_range
+    return query
+
+async def migrate_legacy_timestamps(db) -> int:
+    """Convert ISO-string timestamps written by earlier versions to BSON dates"""
+    # Time-series collections are only ever written with native dates
+    if await is_timeseries(db, "status_checks"):
+        return 0
+    result = await db.status_checks.update_many(
+        {"timestamp": {"$type": "string"}},
+        [{"$set": {"timestamp": {"$toDate": "$timestamp"}}}]
+    )
+    return result.modified_count
+
+@router.post("", response_model=StatusCheck)
+async def create_status_check(input: StatusCheckCreate, request: Request, response: Response):
+    """Record a status check.
+
+    With the write buffer enabled (STATUS_WRITE_BUFFER) the check is queued
+    for a batched insert and 202 is returned; a full queue returns 503.
+    """
+    db = request.app.state.db
+    status_obj = StatusCheck(**input.model_dump())
+    
+    # Stored as a native BSON datetime
+    doc = status_obj.model_dump()
+    if status_writer.running:
+        if not await status_writer.submit(doc):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Status check queue is full",
+                headers={"Retry-After": "1"}
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
+    else:
+        await db.status_checks.insert_one(doc)
+    return status_obj
+
+@router.get("", response_model=List[StatusCheck])
+async def get_status_checks(
+    request: Request,
+    response: Response,
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound (ISO 8601)"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound (ISO 8601)"),
+    client_name: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header")
+):
+    """Get status checks in a time range, newest first, one page at a time"""
+    db = request.app.state.db
+    status_checks, next_cursor = await fetch_page(
+        status_collection(db),
+        build_status_query(since, until, client_name),
+        STATUS_SORT,
+        clamp_page_size(limit, DEFAULT_STATUS_PAGE_SIZE, MAX_STATUS_PAGE_SIZE),
+        cursor=cursor,
+        projection={"_id": 0}
+    )
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if FAST_SERIALIZATION:
+        # Documents were written from StatusCheck; skip re-validating them
+        return Response(content=dumps(status_checks), media_type="application/json", headers=headers)
+    
+    response.headers.update(headers)
+    return status_checks
+
+@router.get("/summary", response_model=List[StatusBucket])
+async def get_status_summary(
+    request: Request,
+    bucket: str = Query("hour", description="minute, hour, day, week or month"),
+    since: Optional[datetime] = Query(None, description="Defaults to 24 hours before until"),
+    until: Optional[datetime] = Query(None, description="Defaults to now"),
+    client_name: Optional[str] = Query(None)
+):
+    """Count status checks per client per time bucket, computed in MongoDB"""
+    if bucket not in BUCKET_UNITS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(BUCKET_UNITS)}"
+        )
+    
+    db = request.app.state.db
+    until = as_utc(until) or datetime.now(timezone.utc)
+    since = as_utc(since) or until - DEFAULT_SUMMARY_WINDOW
+    
+    pipeline = [
+        {"$match": build_status_query(since, until, client_name)},
+        {"$group": {
+            "_id": {
+                "client_name": "$client_name",
+                "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": bucket}},
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$sort": {"_id.bucket": 1, "_id.client_name": 1}},
+        {"$limit": MAX_SUMMARY_ROWS},
+        {"$project": {"_id": 0, "client_name": "$_id.client_name", "bucket": "$_id.bucket", "count": 1}},
+    ]
+    return await status_collection(db).aggregate(pipeline).to_list(length=MAX_SUMMARY_ROWS)
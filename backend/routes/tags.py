@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, status, Query, Request
+from typing import List
+
+from models.post import TrendingTag
+from utils.cache import trending_cache
+from utils.trending import WINDOWS, compute_trending
+
+router = APIRouter(prefix="/tags", tags=["Tags"])
+
+MAX_TRENDING_LIMIT = 50
+
+@router.get("/trending", response_model=List[TrendingTag])
+async def get_trending_tags(
+    request: Request,
+    window: str = Query("24h", description="One of 1h, 24h or 7d"),
+    limit: int = Query(20, ge=1, le=MAX_TRENDING_LIMIT)
+):
+    """Most used post tags over a sliding window.
+    
+    Counts come from per-tag time buckets kept up to date as posts are
+    created and deleted, so this never scans posts; results are also held in
+    memory for a few seconds.
+    """
+    if window not in WINDOWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown window: {window}"
+        )
+    
+    key = (window, limit)
+    trending = trending_cache.get(key)
+    if trending is None:
+        trending = await compute_trending(request.app.state.db, window, limit)
+        trending_cache.set(key, trending)
+    return trending
@@ -1,19 +1,47 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional, List
 from bson import ObjectId
 from datetime import datetime
+from pymongo import ReturnDocument
 import re
 
-from models.user import UserResponse, UserUpdate
-from utils.dependencies import get_current_user, security
+from models.user import UserResponse, UserUpdate, UserFacets, USER_PUBLIC_PROJECTION, USER_SELECTABLE_FIELDS, USER_VIEWS
+from utils.dependencies import get_current_user_id
+from utils.cache import directory_cache, facet_cache, invalidate_user, user_cache
+from utils.etag import etag_matches, make_etag, version_etag, parse_version_etag, http_date, not_modified
+from utils.pagination import clamp_page_size, fetch_page
+from utils.search import build_text_query, fetch_search_page
+from utils.selection import resolve_selection, selection_projection, to_response
+from utils.serialization import dumps
+from utils.summaries import sync_user_summaries
+
+# Directory order: most followed first, _id as a unique tie-breaker
+DIRECTORY_SORT = [("followers", -1), ("_id", 1)]
+
+# Export streaming: documents per cursor batch / response chunk
+EXPORT_BATCH_SIZE = 500
+MAX_EXPORT_BATCH_SIZE = 5000
+
+# Backs conditional profile reads with a covered (index-only) query
+VERSION_INDEX = [("_id", 1), ("updatedAt", 1)]
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-async def get_current_user_with_db(credentials = Depends(security)):
-    """Get current user with database dependency"""
-    # This will need to be updated to use request.app.state.db
-    pass
+def build_directory_query(medium: Optional[str], experience: Optional[str]) -> dict:
+    """Query document for the directory filters"""
+    query = {}
+    
+    # Filter by medium
+    if medium and medium != "All":
+        query["medium"] = medium
+    
+    # Filter by experience
+    if experience and experience != "All":
+        query["experience"] = experience
+    
+    return query
 
 @router.get("", response_model=List[dict])
 async def get_users(
@@ -21,49 +49,206 @@ async def get_users(
     medium: Optional[str] = Query(None),
     experience: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    limit: Optional[int] = Query(None)
+    limit: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    view: Optional[str] = Query(None, description="Named field selection: full (default) or card")
 ):
-    """Get all users with optional filters"""
+    """Get a page of users with optional filters.
+
+    Results are ordered by followers (desc) then _id, or by relevance when
+    searching. When more results exist the cursor for the next page is
+    returned in the X-Next-Cursor header.
+
+    Serialized pages are cached per normalized query and carry a strong
+    ETag; a matching If-None-Match gets 304 Not Modified.
+    
+    ``fields`` or ``view=card`` limit the response to the listed fields; the
+    selection is applied as the Mongo projection, so unused fields are never
+    read. Neither exposes email addresses.
+    """
     db = request.app.state.db
-    query = {}
+    query = build_directory_query(medium, experience)
     
-    # Filter by medium
-    if medium and medium != "All":
-        query["medium"] = medium
+    page_size = clamp_page_size(limit)
+    text_query = build_text_query(search)
+    selected = resolve_selection(fields, view)
+    projection = selection_projection(selected)
     
-    # Filter by experience
-    if experience and experience != "All":
-        query["experience"] = experience
+    cache_key = (query.get("medium"), query.get("experience"), text_query, page_size, cursor, selected)
+    cached = directory_cache.get(cache_key)
     
-    # Search filter
-    if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"username": {"$regex": search, "$options": "i"}},
-            {"bio": {"$regex": search, "$options": "i"}}
-        ]
+    if cached is None:
+        if text_query:
+            # Ranked full-text search backed by the users text index
+            users, next_cursor = await fetch_search_page(
+                db.users,
+                text_query,
+                query,
+                page_size,
+                cursor=cursor,
+                projection=projection
+            )
+        else:
+            # Query one keyset page
+            users, next_cursor = await fetch_page(
+                db.users,
+                query,
+                DIRECTORY_SORT,
+                page_size,
+                cursor=cursor,
+                projection=projection
+            )
+        
+        # Convert ObjectId to string
+        users = [to_response(user, selected) for user in users]
+        
+        body = dumps(users)
+        cached = (body, make_etag(body), next_cursor)
+        directory_cache.set(cache_key, cached)
     
-    # Query users
-    cursor = db.users.find(query, {"password": 0})
+    body, etag, next_cursor = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
     
-    if limit:
-        cursor = cursor.limit(limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    users = await cursor.to_list(length=1000)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/export")
+async def export_users(
+    request: Request,
+    medium: Optional[str] = Query(None),
+    experience: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=MAX_EXPORT_BATCH_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    view: Optional[str] = Query(None, description="Named field selection: card (default) or full"),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Stream all matching users as newline-delimited JSON.
+
+    Takes the same filters and field selection as GET /api/users, in
+    directory order, but requires a login and defaults to the card view.
+    Only selectable fields are ever exported, so "full" here means every
+    selectable field and never includes email. Documents
+    are read from the Motor cursor one batch at a time and each batch is
+    written out before the next is fetched, so memory use does not depend on
+    the size of the export and a slow client slows the cursor down.
+    """
+    db = request.app.state.db
+    query = build_directory_query(medium, experience)
+    text_query = build_text_query(search)
+    if text_query:
+        query["$text"] = {"$search": text_query}
+    selected = resolve_selection(fields, view)
+    if selected is None:
+        selected = USER_SELECTABLE_FIELDS if view == "full" else USER_VIEWS["card"]
+    projection = selection_projection(selected)
+    
+    async def generate():
+        cursor = db.users.find(query, projection).sort(DIRECTORY_SORT).batch_size(batch_size)
+        try:
+            lines = []
+            async for user in cursor:
+                lines.append(dumps(to_response(user, selected)))
+                if len(lines) >= batch_size:
+                    yield b"\n".join(lines) + b"\n"
+                    lines = []
+            if lines:
+                yield b"\n".join(lines) + b"\n"
+        finally:
+            await cursor.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'}
+    )
+
+def facet_branch(field: str, filters: dict) -> list:
+    """$facet sub-pipeline counting users per value of ``field``"""
+    return [
+        {"$match": filters},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$project": {"_id": 0, "value": "$_id", "count": 1}},
+    ]
+
+@router.get("/facets", response_model=UserFacets)
+async def get_user_facets(
+    request: Request,
+    medium: Optional[str] = Query(None),
+    experience: Optional[str] = Query(None),
+    search: Optional[str] = Query(None)
+):
+    """Counts per medium, experience and verified status for the directory filters.
+
+    Takes the same filters as GET /api/users. Each facet is counted with
+    every filter applied except its own, so the medium counts say how many
+    artists each medium option would show given the selected experience and
+    search. ``total`` is the number of artists matching all filters.
+    Computed in one $facet aggregation and cached until a profile changes.
+    """
+    db = request.app.state.db
+    query = build_directory_query(medium, experience)
+    text_query = build_text_query(search)
+    
+    cache_key = (query.get("medium"), query.get("experience"), text_query)
+    facets = facet_cache.get(cache_key)
+    if facets is not None:
+        return facets
     
-    # Convert ObjectId to string
-    for user in users:
-        user["id"] = str(user["_id"])
-        user.pop("_id")
+    medium_filter = {k: v for k, v in query.items() if k == "medium"}
+    experience_filter = {k: v for k, v in query.items() if k == "experience"}
     
-    return users
+    pipeline = []
+    if text_query:
+        pipeline.append({"$match": {"$text": {"$search": text_query}}})
+    pipeline += [
+        {"$project": {"_id": 0, "medium": 1, "experience": 1, "verified": 1}},
+        {"$facet": {
+            "total": [{"$match": query}, {"$count": "count"}],
+            "medium": facet_branch("medium", experience_filter),
+            "experience": facet_branch("experience", medium_filter),
+            "verified": facet_branch("verified", query),
+        }},
+    ]
+    
+    result = (await db.users.aggregate(pipeline).to_list(length=1))[0]
+    facets = {
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "medium": result["medium"],
+        "experience": result["experience"],
+        "verified": result["verified"],
+    }
+    facet_cache.set(cache_key, facets)
+    return facets
+
+def version_headers(updated_at: Optional[datetime]) -> dict:
+    """Validator headers for a profile version"""
+    if updated_at is None:
+        return {}
+    return {
+        "ETag": version_etag(updated_at),
+        "Last-Modified": http_date(updated_at),
+        "Cache-Control": "no-cache",
+    }
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
-    request: Request
+    request: Request,
+    response: Response
 ):
-    """Get a specific user by ID"""
+    """Get a specific user by ID.
+
+    Supports If-None-Match / If-Modified-Since based on the profile's
+    updatedAt. Revalidation is answered from the user cache or a covered
+    index-only query, without fetching the full document.
+    """
     db = request.app.state.db
     if not ObjectId.is_valid(user_id):
         raise HTTPException(
@@ -71,14 +256,36 @@ async def get_user(
             detail="Invalid user ID"
         )
     
-    user = await db.users.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+    user = user_cache.get(user_id)
+    conditional = "if-none-match" in request.headers or "if-modified-since" in request.headers
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+    if user is None and conditional:
+        version = await db.users.find_one(
+            {"_id": ObjectId(user_id)},
+            {"_id": 1, "updatedAt": 1},
+            hint=VERSION_INDEX
         )
+        updated_at = version.get("updatedAt") if version else None
+        if updated_at and not_modified(request.headers, version_etag(updated_at), updated_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version_headers(updated_at))
     
+    if user is None:
+        user = await db.users.find_one({"_id": ObjectId(user_id)}, USER_PUBLIC_PROJECTION)
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        user_cache.set(user_id, user)
+    
+    updated_at = user.get("updatedAt")
+    headers = version_headers(updated_at)
+    if updated_at and conditional and not_modified(request.headers, headers["ETag"], updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    
+    user = dict(user)
     user["id"] = str(user["_id"])
     user.pop("_id")
     
@@ -89,12 +296,19 @@ async def update_user(
     user_id: str,
     user_update: UserUpdate,
     request: Request,
-    current_user = Depends(get_current_user_with_db)
+    response: Response,
+    current_user_id: str = Depends(get_current_user_id)
 ):
-    """Update user profile (authenticated)"""
+    """Update user profile (authenticated).
+
+    The update and the read of the new document happen in one
+    find_one_and_update. Send the profile's ETag in If-Match to make the
+    write conditional: if the profile changed since that version the
+    request fails with 412 instead of overwriting the other edit.
+    """
     db = request.app.state.db
     # Check if user is updating their own profile
-    if str(current_user["_id"]) != user_id:
+    if current_user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this profile"
@@ -117,20 +331,43 @@ async def update_user(
     
     update_data["updatedAt"] = datetime.utcnow()
     
-    # Update user
-    result = await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data}
+    query = {"_id": ObjectId(user_id)}
+    if_match = request.headers.get("if-match")
+    if if_match and if_match.strip() != "*":
+        expected_version = parse_version_etag(if_match)
+        if expected_version is None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Profile has been modified"
+            )
+        query["updatedAt"] = expected_version
+    
+    # Update user and return the post-image
+    updated_user = await db.users.find_one_and_update(
+        query,
+        {"$set": update_data},
+        projection=USER_PUBLIC_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.modified_count == 0:
+    invalidate_user(user_id)
+    
+    if updated_user is None:
+        if "updatedAt" in query and await db.users.find_one({"_id": query["_id"]}, {"_id": 1}):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Profile has been modified"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found or no changes made"
+            detail="User not found"
         )
     
-    # Get updated user
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+    user_cache.set(user_id, updated_user)
+    await sync_user_summaries(db, user_id, update_data)
+    response.headers.update(version_headers(updated_user.get("updatedAt")))
+    
+    updated_user = dict(updated_user)
     updated_user["id"] = str(updated_user["_id"])
     updated_user.pop("_id")
     
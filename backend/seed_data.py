@@ -1,12 +1,17 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
-from utils.auth import get_password_hash
-import os
+import sys
 from dotenv import load_dotenv
 
+# Before the utils imports: pool sizes and timeouts are read at import time
 load_dotenv()
 
+from utils.auth import get_password_hash
+from utils.search import search_fields, backfill_search_fields
+from utils.indexes import ensure_indexes
+from utils.database import database
+from utils.follows import reconcile_follow_counts
+
 # Seed data - 10 high-quality artist profiles
 SEED_USERS = [
     {
@@ -192,38 +197,78 @@ SEED_USERS = [
     }
 ]
 
+# Profile defaults for users created outside the register endpoint
+DEFAULT_PROFILE = {
+    "bio": "",
+    "avatar": "https://images.unsplash.com/photo-1535713875002-d1d0cf377fde?w=400&h=400&fit=crop",
+    "coverImage": "https://images.unsplash.com/photo-1557672172-298e090bd0f1?w=1200&h=400&fit=crop",
+    "location": "",
+    "medium": "Digital",
+    "experience": "Emerging",
+    "social": {
+        "instagram": None,
+        "twitter": None,
+        "website": None
+    },
+    "verified": False,
+    "followers": 0,
+    "following": 0
+}
+
+def prepare_user_document(user_data: dict, hashed_password: str) -> dict:
+    """Build a users document from profile data and an already hashed password"""
+    user_doc = {**DEFAULT_PROFILE, **user_data}
+    user_doc['password'] = hashed_password
+    user_doc['createdAt'] = datetime.utcnow()
+    user_doc['updatedAt'] = datetime.utcnow()
+    user_doc.update(search_fields(user_doc))
+    return user_doc
+
 async def seed_database():
     """Seed the database with initial artist profiles"""
-    mongo_url = os.environ['MONGO_URL']
-    client = AsyncIOMotorClient(mongo_url)
-    db = client[os.environ['DB_NAME']]
-    
-    # Check if users already exist
-    existing_count = await db.users.count_documents({})
-    if existing_count > 0:
-        print(f"✓ Database already has {existing_count} users. Skipping seed.")
-        return
-    
-    print("Seeding database with artist profiles...")
-    
-    # Insert users
-    users_to_insert = []
-    for user_data in SEED_USERS:
-        user_doc = user_data.copy()
-        user_doc['password'] = get_password_hash(user_data['password'])
-        user_doc['createdAt'] = datetime.utcnow()
-        user_doc['updatedAt'] = datetime.utcnow()
-        users_to_insert.append(user_doc)
-    
-    result = await db.users.insert_many(users_to_insert)
-    print(f"✓ Successfully seeded {len(result.inserted_ids)} artist profiles!")
-    
-    # Create indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("username", unique=True)
-    print("✓ Created database indexes")
-    
-    client.close()
+    async with database.session() as db:
+        # Check if users already exist
+        existing_count = await db.users.count_documents({})
+        if existing_count > 0:
+            print(f"✓ Database already has {existing_count} users. Skipping seed.")
+            return
+        
+        print("Seeding database with artist profiles...")
+        
+        # Insert users
+        users_to_insert = []
+        for user_data in SEED_USERS:
+            user_doc = prepare_user_document(user_data, get_password_hash(user_data['password']))
+            users_to_insert.append(user_doc)
+        
+        result = await db.users.insert_many(users_to_insert)
+        print(f"✓ Successfully seeded {len(result.inserted_ids)} artist profiles!")
+        
+        # Create indexes
+        await ensure_indexes(db)
+        print("✓ Created database indexes")
+
+async def backfill_search():
+    """Add search fields to users created before directory search existed"""
+    async with database.session() as db:
+        updated = await backfill_search_fields(db)
+        await ensure_indexes(db)
+        print(f"✓ Backfilled search fields for {updated} users")
+
+async def reconcile_follows():
+    """Recount followers/following from the follow graph.
+
+    Seeded follower counts are kept only on artists nobody has followed or
+    unfollowed yet; anyone with follow edges gets the edge count.
+    """
+    async with database.session() as db:
+        fixed = await reconcile_follow_counts(db)
+        print(f"✓ Reconciled follow counts for {fixed} users")
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
+    if "--backfill-search" in sys.argv:
+        asyncio.run(backfill_search())
+    elif "--reconcile-follows" in sys.argv:
+        asyncio.run(reconcile_follows())
+    else:
+        asyncio.run(seed_database())
@@ -1,99 +1,148 @@
-from fastapi import FastAPI, APIRouter, Depends
+from fastapi import FastAPI, APIRouter
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List
-import uuid
-from datetime import datetime, timezone
+
+from utils.metrics import MetricsMiddleware, Gauge, pool_listener, registry
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from routes import auth, users, follows, status, artworks, images, posts, tags
+from utils.database import database
+from utils.password_pool import password_pool
+from utils.images import image_pool
+from utils.indexes import ensure_indexes, is_timeseries
+from utils.search import backfill_search_fields
+from utils.batch_writer import STATUS_WRITE_BUFFER, status_writer
+from utils.counters import POST_COUNTER_BUFFER, post_counters
+from utils.revocation import revocation_list
 
-# Create the main app without a prefix
-app = FastAPI(title="FlowArt API", version="1.0.0")
+logger = logging.getLogger(__name__)
 
-# Store database in app state
-app.state.db = db
 
-# Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared MongoDB pool and background workers; flush and close on exit"""
+    db = database.connect()
+    # Store database in app state
+    app.state.db = db
+    await database.warmup()
+    await ensure_indexes(db)
+    await status.migrate_legacy_timestamps(db)
+    await auth.migrate_email_case(db)
+    backfilled = await backfill_search_fields(db)
+    if backfilled:
+        logger.info("Backfilled search fields for %d users", backfilled)
+    await revocation_list.start(db)
+    if STATUS_WRITE_BUFFER:
+        # Time-series buckets have no unique _id, so a retried insert can
+        # silently duplicate documents
+        status_writer.start(db.status_checks, retry_unknown=not await is_timeseries(db, "status_checks"))
+    if POST_COUNTER_BUFFER:
+        post_counters.start(db.posts)
+    try:
+        yield
+    finally:
+        # Flush buffered writes while the client is still open
+        await status_writer.stop()
+        await post_counters.stop()
+        await revocation_list.stop()
+        database.close()
+        password_pool.shutdown()
+        image_pool.shutdown()
 
-# Import routes after app is created
-from routes import auth, users
 
+# Create the main app without a prefix
+app = FastAPI(title="FlowArt API", version="1.0.0", lifespan=lifespan)
 
-# Define Models
-class StatusCheck(BaseModel):
-    model_config = ConfigDict(extra="ignore")  # Ignore MongoDB's _id field
-    
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    client_name: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+# Create a router with the /api prefix
+api_router = APIRouter(prefix="/api")
 
-class StatusCheckCreate(BaseModel):
-    client_name: str
 
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "FlowArt API is running"}
 
-@api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.model_dump()
-    status_obj = StatusCheck(**status_dict)
-    
-    # Convert to dict and serialize datetime to ISO string for MongoDB
-    doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
-    
-    _ = await db.status_checks.insert_one(doc)
-    return status_obj
-
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    # Exclude MongoDB's _id field from the query results
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    
-    # Convert ISO string timestamps back to datetime objects
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    
-    return status_checks
-
-# Include auth and user routes
+@api_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Include auth, user, follow, status, artwork, image, community and tag routes
 api_router.include_router(auth.router)
 api_router.include_router(users.router)
+api_router.include_router(follows.router)
+api_router.include_router(status.router)
+api_router.include_router(artworks.router)
+api_router.include_router(images.router)
+api_router.include_router(posts.router)
+api_router.include_router(tags.router)
 
 # Include the router in the main app
 app.include_router(api_router)
 
+registry.register(Gauge(
+    "flowart_password_pool_queue_depth",
+    "Password hashing jobs waiting for a pool slot",
+    lambda: password_pool.stats()["queue_depth"],
+))
+registry.register(Gauge(
+    "flowart_password_pool_in_flight",
+    "Password hashing jobs running on the pool",
+    lambda: password_pool.stats()["in_flight"],
+))
+registry.register(Gauge(
+    "flowart_image_pool_queue_depth",
+    "Image resize jobs waiting for a pool slot",
+    lambda: image_pool.stats()["queue_depth"],
+))
+registry.register(Gauge(
+    "flowart_mongo_pool_connections",
+    "Open MongoDB connections",
+    lambda: pool_listener.open,
+))
+registry.register(Gauge(
+    "flowart_mongo_pool_checked_out",
+    "MongoDB connections in use",
+    lambda: pool_listener.checked_out,
+))
+registry.register(Gauge(
+    "flowart_mongo_pool_waiting",
+    "Operations waiting for a MongoDB connection",
+    lambda: pool_listener.waiting,
+))
+registry.register(Gauge(
+    "flowart_mongo_pool_utilization",
+    "MongoDB connections in use on the busiest server as a fraction of maxPoolSize",
+    database.pool_utilization,
+))
+registry.register(Gauge(
+    "flowart_status_write_queue_depth",
+    "Status checks waiting for a batched insert",
+    status_writer.queue_depth,
+))
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+# Outermost, so CORS handling is included in the measured latency
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
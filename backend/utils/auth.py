@@ -1,14 +1,22 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 import os
+import time
+import uuid
+
+from utils.cache import verified_token_cache
+from utils.metrics import password_hash_duration
+from utils.password_pool import password_pool
+from utils.revocation import revocation_list
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-09876543210")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_DAYS = 7
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -20,25 +28,72 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool without blocking the event loop"""
+    started = time.perf_counter()
+    try:
+        return await password_pool.run(verify_password, plain_password, hashed_password)
+    finally:
+        password_hash_duration.observe(time.perf_counter() - started, "verify")
 
-def decode_access_token(token: str) -> Optional[str]:
-    """Decode a JWT token and return user_id"""
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password pool without blocking the event loop"""
+    started = time.perf_counter()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        return await password_pool.run(get_password_hash, password)
+    finally:
+        password_hash_duration.observe(time.perf_counter() - started, "hash")
+
+def _encode_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
+    to_encode = data.copy()
+    now = datetime.utcnow()
+    to_encode.update({
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + expires_delta,
+    })
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a short-lived JWT access token"""
+    return _encode_token(data, "access", expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a JWT refresh token, exchanged at /api/auth/refresh"""
+    return _encode_token(data, "refresh", expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+def create_token_pair(user_id: str) -> Dict[str, Any]:
+    """Access and refresh tokens as returned by the auth endpoints"""
+    return {
+        "access_token": create_access_token(data={"sub": user_id}),
+        "refresh_token": create_refresh_token(data={"sub": user_id}),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+def decode_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+    """Verify a token of the given type and return its payload.
+
+    Returns None for invalid, expired or wrong-type tokens, and for revoked
+    access tokens. Access token signatures are verified once and cached
+    (never past the token's own exp); the revocation check is an in-memory
+    lookup on every call. Refresh token reuse is checked against Mongo by
+    /api/auth/refresh.
+    """
+    cached = verified_token_cache.get(token) if token_type == "access" else None
+    if cached is not None and cached["exp"] > time.time():
+        payload = cached
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
             return None
-        return user_id
-    except JWTError:
+        if payload.get("type") != token_type or payload.get("sub") is None or payload.get("jti") is None:
+            return None
+        if token_type == "access":
+            verified_token_cache.set(token, payload)
+    
+    if token_type == "access" and revocation_list.is_revoked(payload["jti"]):
         return None
+    return payload
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+STATUS_WRITE_BUFFER = os.getenv("STATUS_WRITE_BUFFER", "false").lower() in ("1", "true", "yes")
+STATUS_FLUSH_INTERVAL_MS = int(os.getenv("STATUS_FLUSH_INTERVAL_MS", "50"))
+STATUS_FLUSH_MAX_DOCS = int(os.getenv("STATUS_FLUSH_MAX_DOCS", "500"))
+STATUS_QUEUE_SIZE = int(os.getenv("STATUS_QUEUE_SIZE", "10000"))
+STATUS_ENQUEUE_TIMEOUT_MS = int(os.getenv("STATUS_ENQUEUE_TIMEOUT_MS", "250"))
+
+# Attempts per batch before its documents are dropped
+MAX_FLUSH_ATTEMPTS = 3
+
+DUPLICATE_KEY = 11000
+
+# Queued by stop(); everything submitted earlier is flushed before it
+_STOP = object()
+
+
+class BatchWriter:
+    """Write-behind buffer that coalesces single inserts into insert_many.
+
+    Documents are queued by submit() and written by a background task in
+    batches of up to ``max_docs``, at least every ``flush_interval``
+    seconds. The queue is bounded: when it is full submit() waits up to
+    ``enqueue_timeout`` seconds for room and then reports failure so the
+    caller can shed load.
+
+    Batches are retried up to MAX_FLUSH_ATTEMPTS times. After an error with
+    an unknown outcome (timeout, dropped connection) a retry relies on the
+    duplicate key error on _id to skip documents that did go in; collections
+    without that guarantee, such as time-series collections, should be
+    started with ``retry_unknown=False`` so such batches are dropped instead.
+    """
+
+    def __init__(self, max_docs: int = 500, flush_interval: float = 0.05, max_queue: int = 10000,
+                 enqueue_timeout: float = 0.25):
+        self.max_docs = max_docs
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self._collection = None
+        self._retry_unknown = True
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, collection, retry_unknown: bool = True):
+        """Start the background flusher for ``collection``"""
+        self._collection = collection
+        self._retry_unknown = retry_unknown
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, doc: Dict[str, Any]) -> bool:
+        """Queue a document; False if the queue stayed full for the enqueue timeout"""
+        if self._closing:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(doc)
+            return True
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self._queue.put(doc), timeout=self.enqueue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_docs:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        for attempt in range(1, MAX_FLUSH_ATTEMPTS + 1):
+            try:
+                await self._collection.insert_many(batch, ordered=False)
+                self.written += len(batch)
+                return
+            except BulkWriteError as e:
+                # Unordered: everything but the reported documents went in
+                errors = e.details.get("writeErrors", [])
+                failed = [batch[error["index"]] for error in errors]
+                self.written += len(batch) - len(failed)
+                duplicates = [batch[error["index"]] for error in errors if error.get("code") == DUPLICATE_KEY]
+                if attempt > 1:
+                    # Already inserted by an earlier attempt whose outcome was unknown
+                    self.written += len(duplicates)
+                else:
+                    self.dropped += len(duplicates)
+                batch = [doc for doc, error in zip(failed, errors) if error.get("code") != DUPLICATE_KEY]
+                if not batch:
+                    return
+            except Exception:
+                if not self._retry_unknown:
+                    # Some of the batch may have been written; a retry could duplicate it
+                    self.dropped += len(batch)
+                    logger.error("Dropping %d buffered documents after a failed insert with unknown outcome",
+                                 len(batch), exc_info=True)
+                    return
+                logger.warning("Buffered insert of %d documents failed (attempt %d)", len(batch), attempt, exc_info=True)
+            if attempt == MAX_FLUSH_ATTEMPTS:
+                self.dropped += len(batch)
+                logger.error("Dropping %d buffered documents after %d attempts", len(batch), attempt)
+                return
+            await asyncio.sleep(0.1 * attempt)
+
+    async def stop(self):
+        """Stop accepting documents and wait until everything queued is written"""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+
+status_writer = BatchWriter(
+    max_docs=STATUS_FLUSH_MAX_DOCS,
+    flush_interval=STATUS_FLUSH_INTERVAL_MS / 1000,
+    max_queue=STATUS_QUEUE_SIZE,
+    enqueue_timeout=STATUS_ENQUEUE_TIMEOUT_MS / 1000,
+)
@@ -0,0 +1,80 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# Configuration
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+DIRECTORY_CACHE_SIZE = int(os.getenv("DIRECTORY_CACHE_SIZE", "512"))
+DIRECTORY_CACHE_TTL_SECONDS = float(os.getenv("DIRECTORY_CACHE_TTL_SECONDS", "30"))
+FACET_CACHE_SIZE = int(os.getenv("FACET_CACHE_SIZE", "256"))
+FACET_CACHE_TTL_SECONDS = float(os.getenv("FACET_CACHE_TTL_SECONDS", "60"))
+TRENDING_CACHE_TTL_SECONDS = float(os.getenv("TRENDING_CACHE_TTL_SECONDS", "30"))
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "10000"))
+VERIFIED_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("VERIFIED_TOKEN_CACHE_TTL_SECONDS", "900"))
+
+
+class TTLCache:
+    """Process-local LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Public user documents (authenticated users and profile views), keyed by user id
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# Serialized GET /api/users pages, keyed by the normalized query
+directory_cache = TTLCache(maxsize=DIRECTORY_CACHE_SIZE, ttl=DIRECTORY_CACHE_TTL_SECONDS)
+
+# GET /api/users/facets results, keyed by the normalized filters
+facet_cache = TTLCache(maxsize=FACET_CACHE_SIZE, ttl=FACET_CACHE_TTL_SECONDS)
+
+# GET /api/tags/trending results, keyed by (window, limit); never invalidated,
+# a new tag shows up within one TTL
+trending_cache = TTLCache(maxsize=64, ttl=TRENDING_CACHE_TTL_SECONDS)
+
+# Verified access token payloads, keyed by the raw token
+verified_token_cache = TTLCache(maxsize=VERIFIED_TOKEN_CACHE_SIZE, ttl=VERIFIED_TOKEN_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: Optional[str] = None):
+    """Drop cached data that a write to a user profile may have made stale"""
+    if user_id is not None:
+        user_cache.invalidate(user_id)
+    directory_cache.clear()
+    facet_cache.clear()
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+POST_COUNTER_BUFFER = os.getenv("POST_COUNTER_BUFFER", "false").lower() in ("1", "true", "yes")
+POST_COUNTER_FLUSH_MS = int(os.getenv("POST_COUNTER_FLUSH_MS", "100"))
+
+
+class CounterBuffer:
+    """Write-behind aggregation of ``$inc`` updates.
+
+    Increments are summed in memory per (document, field) and written as one
+    ``$inc`` per document every ``flush_interval`` seconds, so a burst of
+    likes on one post costs a single update instead of contending on the
+    document. Counts in the database lag by at most one interval; pending()
+    lets readers in this process add the delta not yet written, including
+    a batch whose write is still in flight.
+
+    Increments rejected by the server are retried with the next flush. If a
+    flush fails without saying which updates were applied (timeout, lost
+    connection) the batch is dropped and logged rather than retried, since
+    a retry could apply it twice.
+    """
+
+    def __init__(self, flush_interval: float = 0.1):
+        self.flush_interval = flush_interval
+        self._collection = None
+        self._deltas: Dict[Any, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._in_flight: Dict[Any, Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.flushes = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def add(self, doc_id: Any, field: str, delta: int):
+        self._deltas[doc_id][field] += delta
+
+    def pending(self, doc_id: Any, field: str) -> int:
+        total = 0
+        for batch in (self._deltas, self._in_flight):
+            deltas = batch.get(doc_id)
+            if deltas:
+                total += deltas.get(field, 0)
+        return total
+
+    def start(self, collection):
+        self._collection = collection
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        # Never cancelled mid-write: stop() sets the event and waits for the final flush
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self):
+        if not self._deltas:
+            return
+        # Swap before awaiting, so increments arriving mid-write go to the next batch
+        deltas, self._deltas = self._deltas, defaultdict(lambda: defaultdict(int))
+        pending = [(doc_id, dict(fields)) for doc_id, fields in deltas.items() if any(fields.values())]
+        if not pending:
+            return
+        self._in_flight = dict(pending)
+        requests = [
+            UpdateOne({"_id": doc_id}, {"$inc": {field: delta for field, delta in fields.items() if delta}})
+            for doc_id, fields in pending
+        ]
+        try:
+            await self._collection.bulk_write(requests, ordered=False)
+            self.flushes += 1
+        except BulkWriteError as e:
+            # Put back the increments the server rejected; they go out with the next flush
+            failed = [pending[error["index"]] for error in e.details.get("writeErrors", [])]
+            for doc_id, fields in failed:
+                for field, delta in fields.items():
+                    self._deltas[doc_id][field] += delta
+            logger.exception("Counter flush failed for %d of %d documents", len(failed), len(requests))
+        except Exception:
+            # Some updates may have been applied; retrying could double count
+            self.dropped += len(pending)
+            logger.exception("Counter flush with unknown outcome; dropping increments for %d documents: %s",
+                             len(pending), pending)
+        finally:
+            self._in_flight = {}
+
+    async def stop(self):
+        """Write out everything pending and stop flushing"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+
+post_counters = CounterBuffer(flush_interval=POST_COUNTER_FLUSH_MS / 1000)
@@ -0,0 +1,93 @@
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from utils.metrics import mongo_listener, pool_listener
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
+
+def client_options() -> dict:
+    """Keyword arguments for AsyncIOMotorClient built from the environment"""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+        "event_listeners": [mongo_listener, pool_listener],
+    }
+    # 0 means "no timeout", which is the driver default when omitted
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    return options
+
+
+class Database:
+    """The process-wide MongoDB client.
+
+    The server opens it from its lifespan and scripts use session(); either
+    way there is one connection pool per process.
+    """
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.db: Optional[AsyncIOMotorDatabase] = None
+
+    def connect(self) -> AsyncIOMotorDatabase:
+        """Create the client if needed and return the application database"""
+        if self.client is None:
+            self.client = AsyncIOMotorClient(os.environ['MONGO_URL'], **client_options())
+            self.db = self.client[os.environ['DB_NAME']]
+        return self.db
+
+    async def warmup(self):
+        """Round-trip a ping so server selection and the first connection happen before traffic"""
+        started = time.perf_counter()
+        await self.client.admin.command("ping")
+        logger.info("MongoDB ping took %.1fms", (time.perf_counter() - started) * 1000)
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self.db = None
+
+    def pool_utilization(self) -> float:
+        """Checked-out connections on the busiest server as a fraction of maxPoolSize.
+
+        0 when maxPoolSize is 0, which pymongo treats as unbounded.
+        """
+        if MONGO_MAX_POOL_SIZE <= 0:
+            return 0.0
+        return pool_listener.busiest_server() / MONGO_MAX_POOL_SIZE
+
+    @asynccontextmanager
+    async def session(self):
+        """Connected database for scripts; closes the client on exit"""
+        db = self.connect()
+        try:
+            await self.warmup()
+            yield db
+        finally:
+            self.close()
+
+
+database = Database()
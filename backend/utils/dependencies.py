@@ -1,38 +1,50 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional
 from bson import ObjectId
-import os
 
-from utils.auth import decode_access_token
+from models.user import USER_PUBLIC_PROJECTION
+from utils.auth import decode_token
+from utils.cache import user_cache
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncIOMotorDatabase = None):
-    """Dependency to get current authenticated user"""
-    token = credentials.credentials
-    user_id = decode_access_token(token)
+async def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """Dependency returning the verified access token payload.
+
+    Signature checks are cached and revocation is an in-memory lookup, so
+    this never touches the database.
+    """
+    payload = decode_token(credentials.credentials, "access")
     
-    if user_id is None:
+    if payload is None or not ObjectId.is_valid(payload["sub"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Get user from database
-    if db is None:
-        from motor.motor_asyncio import AsyncIOMotorClient
-        mongo_url = os.environ['MONGO_URL']
-        client = AsyncIOMotorClient(mongo_url)
-        db = client[os.environ['DB_NAME']]
-    
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
+    return payload
+
+async def get_current_user_id(payload: dict = Depends(get_token_payload)) -> str:
+    """Dependency for endpoints that only need to know who is calling"""
+    return payload["sub"]
+
+async def get_current_user(request: Request, user_id: str = Depends(get_current_user_id)):
+    """Dependency to get current authenticated user.
+
+    User documents are served from the process-local user cache when
+    possible; profile writes invalidate the cached entry.
+    """
+    user = user_cache.get(user_id)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+        # Get user from database
+        db = request.app.state.db
+        user = await db.users.find_one({"_id": ObjectId(user_id)}, USER_PUBLIC_PROJECTION)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        user_cache.set(user_id, user)
     
-    return user
+    # Callers may modify the returned document
+    return dict(user)
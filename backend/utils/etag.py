@@ -0,0 +1,82 @@
+import calendar
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match / If-Match header value matches ``etag``.
+
+    Handles ``*`` and comma-separated lists; weak validators compare equal to
+    their strong counterpart as If-None-Match requires.
+    """
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    if "*" in candidates:
+        return True
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def _to_millis(value: datetime) -> int:
+    return calendar.timegm(value.utctimetuple()) * 1000 + value.microsecond // 1000
+
+
+def version_etag(updated_at: datetime) -> str:
+    """Strong ETag for a document version, derived from its updatedAt.
+
+    MongoDB stores datetimes with millisecond precision, so the millisecond
+    timestamp identifies a stored version exactly.
+    """
+    return f'"{_to_millis(updated_at)}"'
+
+
+def parse_version_etag(value: str) -> Optional[datetime]:
+    """Inverse of version_etag: the naive UTC updatedAt an ETag refers to.
+
+    Weak or malformed validators return None; If-Match needs a strong match.
+    """
+    value = value.strip()
+    if len(value) < 3 or not (value.startswith('"') and value.endswith('"')):
+        return None
+    try:
+        millis = int(value[1:-1])
+    except ValueError:
+        return None
+    return datetime(1970, 1, 1) + timedelta(milliseconds=millis)
+
+
+def http_date(value: datetime) -> str:
+    """Format a (naive UTC or aware) datetime for Last-Modified"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def not_modified(headers, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current version.
+
+    If-Modified-Since is only consulted when If-None-Match is absent.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
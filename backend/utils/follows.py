@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, List
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+
+async def count_edges(db, field: str, user_ids: List[ObjectId]) -> Dict[ObjectId, int]:
+    """Follow edges per user, grouped on ``field`` (followeeId or followerId)"""
+    pipeline = [
+        {"$match": {field: {"$in": user_ids}}},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+    ]
+    return {doc["_id"]: doc["count"] async for doc in db.follows.aggregate(pipeline)}
+
+
+async def recount_users(db, users: List[dict], skip_unlinked: bool = False) -> int:
+    """Reset the counters of ``users`` that disagree with their edges; returns users fixed.
+
+    ``users`` carry the stored followers/following. Each reset is
+    conditional on the counter still holding that value, so a follow
+    landing in between is left alone rather than overwritten. With
+    ``skip_unlinked``, users with no edges either way and no following
+    are left alone: their followers are seeded or imported, not drift.
+    """
+    ids = [user["_id"] for user in users]
+    followers = await count_edges(db, "followeeId", ids)
+    following = await count_edges(db, "followerId", ids)
+
+    now = datetime.utcnow()
+    requests = []
+    for user in users:
+        if skip_unlinked and user["_id"] not in followers and user["_id"] not in following and not user.get("following"):
+            continue
+        for field, counts in (("followers", followers), ("following", following)):
+            actual = counts.get(user["_id"], 0)
+            stored = user.get(field, 0)
+            if stored != actual:
+                current = {field: stored} if field in user else {field: {"$exists": False}}
+                requests.append(UpdateOne({"_id": user["_id"], **current}, {"$set": {field: actual, "updatedAt": now}}))
+    if not requests:
+        return 0
+    result = await db.users.bulk_write(requests, ordered=False)
+    return result.modified_count
+
+
+async def repair_follow_counts(db, user_ids: List[ObjectId]) -> int:
+    """Recount specific users, e.g. after a counter update failed mid-follow"""
+    users = await db.users.find({"_id": {"$in": user_ids}}, {"followers": 1, "following": 1}).to_list(length=len(user_ids))
+    return await recount_users(db, users)
+
+
+async def reconcile_follow_counts(db, batch_size: int = 500) -> int:
+    """Recount followers/following from the follows edges; returns users fixed.
+
+    Edge writes and counter updates are separate writes, so a crash between
+    them leaves a counter off by one. This walks the users in _id order and
+    resets every counter that disagrees with its edges, a follow landing
+    mid-run being left for the next run.
+
+    Users without any edges and with no following are skipped, so seeded or
+    imported follower counts on accounts nobody has followed survive. As
+    soon as a user has an edge, though, their seeded count is replaced by
+    the edge count: reconciling destroys seeded numbers on any account
+    that is part of the follow graph.
+    """
+    fixed = 0
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        users = await db.users.find(query, {"followers": 1, "following": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not users:
+            return fixed
+        last_id = users[-1]["_id"]
+        fixed += await recount_users(db, users, skip_unlinked=True)
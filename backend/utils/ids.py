@@ -0,0 +1,12 @@
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+
+def parse_object_id(value: str, label: str) -> ObjectId:
+    """ObjectId from a path or query parameter; 400 if it is malformed"""
+    if not ObjectId.is_valid(value):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {label} ID"
+        )
+    return ObjectId(value)
@@ -0,0 +1,85 @@
+import hashlib
+import io
+import os
+from typing import Any, Dict, Tuple
+
+from PIL import Image, ImageOps
+
+from utils.worker_pool import WorkerPool
+
+# Configuration
+IMAGE_EXECUTOR = os.getenv("IMAGE_EXECUTOR", "process")  # process | thread | inline
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(40_000_000)))
+
+# Derivative name -> longest edge in pixels; aspect ratio is kept
+DERIVATIVES = {
+    "thumbnail": 160,
+    "card": 600,
+    "full": 1600,
+}
+
+# Output format -> (content type, encoder options)
+FORMATS = {
+    "webp": ("image/webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpg": ("image/jpeg", {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}),
+}
+
+ACCEPTED_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+
+class ImageTooLarge(ValueError):
+    """The upload decodes to more than MAX_IMAGE_PIXELS pixels"""
+
+
+def content_hash(data: bytes) -> str:
+    """Content address of an upload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def render_derivatives(data: bytes) -> Dict[str, Any]:
+    """Decode an upload and encode every derivative; runs on the image pool.
+
+    Raises ValueError for anything that is not an accepted image, and
+    ImageTooLarge for images over MAX_IMAGE_PIXELS.
+    """
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.format not in ACCEPTED_FORMATS:
+            raise ValueError(f"Unsupported image format: {image.format}")
+        # Pillow only warns between the limit and twice the limit; check the
+        # header dimensions ourselves before anything is decoded
+        if image.width * image.height > MAX_IMAGE_PIXELS:
+            raise ImageTooLarge("Image dimensions are too large")
+        image.load()
+    except Image.DecompressionBombError:
+        raise ImageTooLarge("Image dimensions are too large") from None
+    except OSError:
+        raise ValueError("Not a valid image") from None
+
+    # Camera uploads carry their rotation in EXIF; bake it in
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "L"):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    width, height = image.size
+
+    derivatives: Dict[Tuple[str, str], bytes] = {}
+    for name, edge in DERIVATIVES.items():
+        resized = image.copy()
+        # Never upscale: small originals are re-encoded at their own size
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+        for fmt, (_, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, **options)
+            derivatives[(name, fmt)] = buffer.getvalue()
+
+    return {"width": width, "height": height, "derivatives": derivatives}
+
+
+# Resizing is CPU-bound like password hashing, so it gets its own capped pool
+image_pool = WorkerPool(mode=IMAGE_EXECUTOR, workers=IMAGE_WORKERS, name="image")
@@ -0,0 +1,173 @@
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from utils.search import SEARCH_INDEX_KEYS, SEARCH_INDEX_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+# Collections created with options; time-series needs MongoDB 6.0+ for the
+# secondary indexes below, older servers get a regular collection.
+TIMESERIES_COLLECTIONS = {
+    "status_checks": {"timeField": "timestamp", "metaField": "client_name", "granularity": "seconds"},
+}
+TIMESERIES_MIN_VERSION = (6, 0)
+
+# How many colliding values to log when a unique index cannot be built
+DUPLICATE_SAMPLE_SIZE = 10
+
+# Every index the application relies on, per collection. Query paths in
+# routes/ should be backed by one of these; names are left to MongoDB's
+# defaults so indexes created by older seed runs are recognised.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        # register/login lookups and uniqueness
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("username", ASCENDING)], unique=True),
+        # GET /api/users: directory order, optionally filtered
+        IndexModel([("followers", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("medium", ASCENDING), ("followers", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("experience", ASCENDING), ("followers", DESCENDING), ("_id", ASCENDING)]),
+        IndexModel([("medium", ASCENDING), ("experience", ASCENDING), ("followers", DESCENDING), ("_id", ASCENDING)]),
+        # Conditional GET /api/users/{id}: covered (_id, updatedAt) lookups
+        IndexModel([("_id", ASCENDING), ("updatedAt", ASCENDING)]),
+        # GET /api/users?search=
+        IndexModel(SEARCH_INDEX_KEYS, **SEARCH_INDEX_OPTIONS),
+    ],
+    "status_checks": [
+        # GET /api/status: newest first, optionally within since/until
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)]),
+        # GET /api/status?client_name= and the per-client summary
+        IndexModel([("client_name", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "artworks": [
+        # GET /api/artworks: recent feed
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        # ?artist_id= feed; also used to sync denormalized artist summaries
+        IndexModel([("artistId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        # ?medium= feed
+        IndexModel([("medium", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "posts": [
+        # GET /api/posts: feed, optionally by type, tag or author
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("type", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("tags", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("authorId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "post_likes": [
+        # One like per user and post; makes likes idempotent
+        IndexModel([("postId", ASCENDING), ("userId", ASCENDING)], unique=True),
+    ],
+    "post_comments": [
+        # GET /api/posts/{id}/comments
+        IndexModel([("postId", ASCENDING), ("createdAt", ASCENDING), ("_id", ASCENDING)]),
+        # Author summary sync on profile updates
+        IndexModel([("authorId", ASCENDING)]),
+    ],
+    "follows": [
+        # One edge per pair; makes follows idempotent and serves ?ids= checks
+        IndexModel([("followerId", ASCENDING), ("followeeId", ASCENDING)], unique=True),
+        # GET /api/users/{id}/followers and /following
+        IndexModel([("followeeId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("followerId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "tag_stats": [
+        # One counter per tag and time bucket; record_tags upserts on it
+        IndexModel([("tag", ASCENDING), ("unit", ASCENDING), ("start", ASCENDING)], unique=True),
+        # GET /api/tags/trending sums the buckets inside a window
+        IndexModel([("unit", ASCENDING), ("start", ASCENDING)]),
+        # Buckets are dropped once they fall out of every window
+        IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "revoked_tokens": [
+        # Entries are useless once the token has expired; also serves the
+        # initial revocation load
+        IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+        # Incremental revocation sync
+        IndexModel([("revokedAt", ASCENDING)]),
+    ],
+}
+
+
+async def ensure_collections(db):
+    """Create collections that need options before anything writes to them"""
+    existing = await db.list_collection_names()
+    server_info = await db.client.server_info()
+    version = tuple(server_info.get("versionArray", [0, 0])[:2])
+    for name, timeseries in TIMESERIES_COLLECTIONS.items():
+        if name in existing:
+            continue
+        if version >= TIMESERIES_MIN_VERSION:
+            await db.create_collection(name, timeseries=timeseries)
+            logger.info("Created time-series collection %s", name)
+
+
+async def is_timeseries(db, name: str) -> bool:
+    """Whether ``name`` exists as a time-series collection"""
+    return bool(await db.list_collection_names(filter={"name": name, "type": "timeseries"}))
+
+
+async def check_indexes(db) -> Dict[str, Dict[str, List[str]]]:
+    """Compare the registry with the indexes that exist in the database"""
+    report = {}
+    for collection_name, models in INDEXES.items():
+        expected = [model.document["name"] for model in models]
+        existing = [index["name"] async for index in db[collection_name].list_indexes()]
+        report[collection_name] = {
+            "missing": [name for name in expected if name not in existing],
+            "extra": [name for name in existing if name not in expected and name != "_id_"],
+        }
+    return report
+
+
+async def find_duplicates(collection, model: IndexModel, limit: int = DUPLICATE_SAMPLE_SIZE) -> List[dict]:
+    """Key values that occur more than once, i.e. what blocks a unique index"""
+    keys = [key for key, _ in model.document["key"].items()]
+    pipeline = [
+        {"$group": {"_id": {key: f"${key}" for key in keys}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": limit},
+    ]
+    return await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=limit)
+
+
+async def ensure_indexes(db) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing collections and registry indexes; safe to call on every startup.
+
+    Returns the report from before creation. Extra indexes are only logged,
+    never dropped. An index that cannot be built (typically a unique index
+    over existing duplicates) is logged with the colliding values and
+    skipped, so startup continues; fix the data and restart to build it.
+    """
+    await ensure_collections(db)
+    report = await check_indexes(db)
+    for collection_name, result in report.items():
+        if result["missing"]:
+            collection = db[collection_name]
+            created = []
+            for model in INDEXES[collection_name]:
+                name = model.document["name"]
+                if name not in result["missing"]:
+                    continue
+                try:
+                    await collection.create_indexes([model])
+                except OperationFailure as exc:
+                    if model.document.get("unique"):
+                        duplicates = await find_duplicates(collection, model)
+                        logger.error(
+                            "Could not create unique index %s on %s; duplicate values: %s",
+                            name, collection_name, duplicates or exc
+                        )
+                    else:
+                        logger.error("Could not create index %s on %s: %s", name, collection_name, exc)
+                    continue
+                created.append(name)
+            if created:
+                logger.info("Created indexes on %s: %s", collection_name, ", ".join(created))
+        if result["extra"]:
+            logger.warning("Indexes on %s not in the registry: %s", collection_name, ", ".join(result["extra"]))
+    return report
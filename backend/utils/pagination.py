@@ -0,0 +1,102 @@
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, status
+
+# Configuration
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+SortSpec = List[Tuple[str, int]]
+
+# Types a sort key can hold. Cursors are client input and their values go into
+# the query as-is, so anything else (a dict like {"$gt": ...} in particular)
+# is rejected rather than passed through as an operator.
+CURSOR_VALUE_TYPES = (int, float, str, datetime, ObjectId, type(None))
+
+
+def clamp_page_size(limit: Optional[int], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """Clamp a client-supplied page size to the server-side bounds"""
+    if not limit or limit < 1:
+        return default
+    return min(limit, maximum)
+
+
+def get_sort_value(doc: Dict[str, Any], field: str) -> Any:
+    """Read a (possibly dotted) sort field from a document"""
+    value: Any = doc
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    """Build an opaque cursor from the sort key of the last document on a page"""
+    values = [get_sort_value(doc, field) for field, _ in sort]
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(sort)
+        or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: List[Any]) -> Dict[str, Any]:
+    """Build a query matching documents strictly after ``values`` in ``sort`` order.
+
+    For sort [(a, -1), (b, 1)] this produces
+    {"$or": [{a: {"$lt": va}}, {a: va, b: {"$gt": vb}}]}, which MongoDB can
+    answer with a bounded scan of an index on the same keys.
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def combine_filters(*filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """AND together non-empty query documents"""
+    filters = [f for f in filters if f]
+    if not filters:
+        return {}
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": list(filters)}
+
+
+async def fetch_page(collection, query: Dict[str, Any], sort: SortSpec, limit: int,
+                     cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None):
+    """Fetch one keyset page; returns (documents, next_cursor)"""
+    if cursor:
+        query = combine_filters(query, keyset_filter(sort, decode_cursor(cursor, sort)))
+
+    # Fetch one extra document to learn whether another page exists
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort)
+    return docs, next_cursor
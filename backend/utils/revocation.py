@@ -0,0 +1,105 @@
+import asyncio
+import calendar
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+
+# Re-read revocations this far behind the last sync, covering clock skew
+# between app servers and writes that commit out of order
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationList:
+    """In-memory set of revoked access token ids, kept in sync with ``revoked_tokens``.
+
+    Every revocation is written to Mongo (``_id`` is the token's jti, a TTL
+    index on ``expiresAt`` removes it once the token could no longer be used
+    anyway). Access tokens are checked on every request, so their
+    revocations are also kept in the local set; a background task polls for
+    revocations made by other processes, so they take effect here within
+    ``sync_interval`` seconds. Refresh tokens live for weeks and are only
+    presented to /api/auth/refresh, which checks them against Mongo, so they
+    are not held in memory.
+    """
+
+    def __init__(self, sync_interval: float = 5.0):
+        self.sync_interval = sync_interval
+        self._revoked: Dict[str, float] = {}
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._synced_at: Optional[datetime] = None
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    async def revoke(self, db, payload: dict) -> bool:
+        """Revoke a decoded token; False if it had already been revoked"""
+        jti = payload["jti"]
+        try:
+            await db.revoked_tokens.insert_one({
+                "_id": jti,
+                "sub": payload.get("sub"),
+                "type": payload.get("type"),
+                "expiresAt": datetime.utcfromtimestamp(payload["exp"]),
+                "revokedAt": datetime.utcnow(),
+            })
+        except DuplicateKeyError:
+            return False
+        # Only once stored, so every process agrees on what is revoked
+        if payload.get("type") == "access":
+            self._revoked[jti] = float(payload["exp"])
+        return True
+
+    async def sync(self):
+        """Pull revocations recorded since the last sync and prune expired ones"""
+        now = datetime.utcnow()
+        if self._synced_at is None:
+            query = {"expiresAt": {"$gt": now}, "type": "access"}
+        else:
+            query = {"revokedAt": {"$gte": self._synced_at - SYNC_OVERLAP}, "type": "access"}
+        async for doc in self._db.revoked_tokens.find(query, {"expiresAt": 1}):
+            self._revoked[doc["_id"]] = calendar.timegm(doc["expiresAt"].utctimetuple())
+        self._synced_at = now
+
+        cutoff = time.time()
+        for jti in [jti for jti, exp in self._revoked.items() if exp <= cutoff]:
+            del self._revoked[jti]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Token revocation sync failed")
+
+    async def start(self, db):
+        """Load current revocations, then keep syncing in the background"""
+        self._db = db
+        await self.sync()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+revocation_list = RevocationList(sync_interval=REVOCATION_SYNC_SECONDS)
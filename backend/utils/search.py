@@ -0,0 +1,112 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from pymongo import TEXT, UpdateOne
+
+from utils.pagination import combine_filters, decode_cursor, encode_cursor, keyset_filter
+
+# Configuration
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 15
+MAX_QUERY_TERMS = 8
+
+SEARCH_INDEX_NAME = "users_search"
+
+# Relevance weights: whole-word hits on name/username beat prefix hits,
+# which beat mentions in the bio.
+SEARCH_INDEX_KEYS = [("name", TEXT), ("username", TEXT), ("searchPrefixes", TEXT), ("bio", TEXT)]
+SEARCH_INDEX_OPTIONS = {
+    "name": SEARCH_INDEX_NAME,
+    "weights": {"name": 10, "username": 8, "searchPrefixes": 3, "bio": 1},
+    # Names are not English prose: no stemming or stop words
+    "default_language": "none",
+}
+
+# Search results: best match first, then the directory order
+SEARCH_SORT = [("score", -1), ("followers", -1), ("_id", 1)]
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase alphanumeric words"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def build_search_prefixes(*values: Optional[str]) -> List[str]:
+    """Edge n-grams of every word in ``values``, used for prefix matching"""
+    prefixes = []
+    seen = set()
+    for value in values:
+        for token in tokenize(value):
+            for length in range(MIN_PREFIX_LENGTH, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                prefix = token[:length]
+                if prefix not in seen:
+                    seen.add(prefix)
+                    prefixes.append(prefix)
+    return prefixes
+
+
+def search_fields(user_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Derived fields that keep a user document searchable"""
+    return {"searchPrefixes": build_search_prefixes(user_doc.get("name"), user_doc.get("username"))}
+
+
+def build_text_query(search: Optional[str]) -> Optional[str]:
+    """Turn raw user input into a safe $text search string.
+
+    Only plain words survive, so quotes and negation operators in the input
+    cannot change the meaning of the query.
+    """
+    terms = []
+    for token in tokenize(search):
+        token = token[:MAX_PREFIX_LENGTH]
+        if token not in terms:
+            terms.append(token)
+    if not terms:
+        return None
+    return " ".join(terms[:MAX_QUERY_TERMS])
+
+
+async def fetch_search_page(collection, text_query: str, filters: Dict[str, Any], limit: int,
+                            cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None):
+    """Fetch one page of ranked search results; returns (documents, next_cursor)"""
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": combine_filters({"$text": {"$search": text_query}}, filters)},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        pipeline.append({"$match": keyset_filter(SEARCH_SORT, decode_cursor(cursor, SEARCH_SORT))})
+    pipeline.append({"$sort": dict(SEARCH_SORT)})
+    pipeline.append({"$limit": limit + 1})
+    if projection:
+        pipeline.append({"$project": projection})
+
+    docs = await collection.aggregate(pipeline).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], SEARCH_SORT)
+    for doc in docs:
+        doc.pop("score", None)
+    return docs, next_cursor
+
+
+async def backfill_search_fields(db, batch_size: int = 500) -> int:
+    """Populate search fields on users written before search existed"""
+    updated = 0
+    requests = []
+    cursor = db.users.find({"searchPrefixes": {"$exists": False}}, {"name": 1, "username": 1})
+    async for user in cursor:
+        requests.append(UpdateOne({"_id": user["_id"]}, {"$set": search_fields(user)}))
+        if len(requests) >= batch_size:
+            await db.users.bulk_write(requests, ordered=False)
+            updated += len(requests)
+            requests = []
+    if requests:
+        await db.users.bulk_write(requests, ordered=False)
+        updated += len(requests)
+    return updated
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from models.user import USER_PUBLIC_PROJECTION, USER_SELECTABLE_FIELDS, USER_VIEWS
+
+# Read alongside any field selection: page cursors are built from them
+SELECTION_SORT_FIELDS = ("followers", "score")
+
+
+def resolve_selection(fields: Optional[str], view: Optional[str]) -> Optional[tuple]:
+    """Fields requested with ?fields= or ?view=, or None for the full profile"""
+    if fields and view:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view"
+        )
+    if view and view != "full":
+        if view not in USER_VIEWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown view: {view}"
+            )
+        return USER_VIEWS[view]
+    if fields:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = selected - set(USER_SELECTABLE_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        # Canonical order, so equivalent selections share a cache entry
+        return tuple(field for field in USER_SELECTABLE_FIELDS if field in selected or field == "id")
+    return None
+
+
+def selection_projection(selected: Optional[tuple]) -> dict:
+    """Mongo projection for a field selection"""
+    if selected is None:
+        return USER_PUBLIC_PROJECTION
+    projection = {field: 1 for field in selected if field != "id"}
+    projection.update({field: 1 for field in SELECTION_SORT_FIELDS})
+    return projection
+
+
+def to_response(user: dict, selected: Optional[tuple]) -> dict:
+    """Replace _id with id and drop fields read only for pagination"""
+    user["id"] = str(user.pop("_id"))
+    if selected is not None:
+        for field in SELECTION_SORT_FIELDS:
+            if field not in selected:
+                user.pop(field, None)
+    return user
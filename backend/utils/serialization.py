@@ -0,0 +1,24 @@
+import json
+import os
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+# Configuration
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "false").lower() in ("1", "true", "yes")
+
+# pydantic-core serializer built once at import; dumps plain dicts/lists of
+# JSON-compatible values plus datetimes straight to bytes.
+_json_adapter = TypeAdapter(Any)
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize already-clean response data (ObjectIds converted) to JSON bytes.
+
+    With FAST_SERIALIZATION enabled this skips jsonable_encoder and encodes
+    in pydantic-core; otherwise it matches FastAPI's default JSON output.
+    """
+    if FAST_SERIALIZATION:
+        return _json_adapter.dump_json(data)
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
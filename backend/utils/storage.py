@@ -0,0 +1,94 @@
+import asyncio
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+# Configuration
+IMAGE_STORAGE = os.getenv("IMAGE_STORAGE", "local")  # local | s3
+IMAGE_STORAGE_DIR = os.getenv("IMAGE_STORAGE_DIR", str(Path(__file__).resolve().parent.parent / "media"))
+IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "/api/images")
+IMAGE_S3_BUCKET = os.getenv("IMAGE_S3_BUCKET", "")
+IMAGE_S3_PREFIX = os.getenv("IMAGE_S3_PREFIX", "images/")
+
+# Keys are content addressed, so stored objects never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class BlobStore(ABC):
+    """Minimal key/value blob storage used for uploaded images"""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str):
+        """Store ``data`` under ``key``, replacing any existing blob"""
+
+    def url(self, key: str) -> str:
+        return f"{IMAGE_BASE_URL}/{key}"
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path for stores the API serves itself, else None"""
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under ``root``, served by GET /api/images"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def local_path(self, key: str) -> Path:
+        return self.root / key
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await asyncio.to_thread(self._write, self.local_path(key), data)
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        # Write then rename, so readers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # mkstemp creates the file 0600; blobs are served to everyone
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class S3BlobStore(BlobStore):
+    """Blobs in an S3 bucket; IMAGE_BASE_URL should point at the bucket or its CDN"""
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = boto3.client("s3")
+
+    def url(self, key: str) -> str:
+        return f"{IMAGE_BASE_URL}/{self.prefix}{key}"
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await asyncio.to_thread(
+            self._client.put_object,
+            Bucket=self.bucket,
+            Key=self.prefix + key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+        )
+
+
+def create_blob_store() -> BlobStore:
+    if IMAGE_STORAGE == "s3":
+        return S3BlobStore(IMAGE_S3_BUCKET, IMAGE_S3_PREFIX)
+    if IMAGE_STORAGE != "local":
+        raise ValueError(f"Unknown image storage: {IMAGE_STORAGE}")
+    return LocalBlobStore(IMAGE_STORAGE_DIR)
+
+
+blob_store = create_blob_store()
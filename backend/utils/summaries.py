@@ -0,0 +1,20 @@
+from bson import ObjectId
+
+from models.artwork import ARTIST_SUMMARY_FIELDS
+
+
+async def sync_user_summaries(db, user_id: str, update: dict):
+    """Copy changed profile fields onto the user's artworks, posts and comments.
+
+    Artworks, posts and comments embed a summary of their author (see
+    ARTIST_SUMMARY_FIELDS) so feeds render without a users lookup; every
+    profile write that may touch those fields calls this.
+    """
+    changes = {field: update[field] for field in ARTIST_SUMMARY_FIELDS if field in update}
+    if not changes:
+        return
+    owner = ObjectId(user_id)
+    await db.artworks.update_many({"artistId": owner}, {"$set": {f"artist.{k}": v for k, v in changes.items()}})
+    author_changes = {f"author.{k}": v for k, v in changes.items()}
+    await db.posts.update_many({"authorId": owner}, {"$set": author_changes})
+    await db.post_comments.update_many({"authorId": owner}, {"$set": author_changes})
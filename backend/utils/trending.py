@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from pymongo import UpdateOne
+
+# Tag counts are kept in time buckets in tag_stats: fine buckets for the
+# short window, hourly ones for the long windows. Each post write touches one
+# bucket of each size per tag; each bucket expires once no window needs it.
+BUCKET_UNITS: Dict[str, timedelta] = {
+    "5m": timedelta(minutes=5),
+    "1h": timedelta(hours=1),
+}
+BUCKET_RETENTION: Dict[str, timedelta] = {
+    "5m": timedelta(hours=1),
+    "1h": timedelta(days=7),
+}
+
+# Window name -> (length, bucket unit summed over)
+WINDOWS: Dict[str, Tuple[timedelta, str]] = {
+    "1h": (timedelta(hours=1), "5m"),
+    "24h": (timedelta(hours=24), "1h"),
+    "7d": (timedelta(days=7), "1h"),
+}
+
+
+def bucket_start(at: datetime, unit: str) -> datetime:
+    """Start of the ``unit`` bucket containing ``at``"""
+    size = int(BUCKET_UNITS[unit].total_seconds())
+    epoch = datetime(1970, 1, 1)
+    seconds = int((at - epoch).total_seconds())
+    return epoch + timedelta(seconds=seconds - seconds % size)
+
+
+async def record_tags(db, tags: Iterable[str], at: datetime, delta: int = 1):
+    """Add ``delta`` to every tag's buckets for a post created at ``at``"""
+    now = datetime.utcnow()
+    requests = []
+    for unit, size in BUCKET_UNITS.items():
+        start = bucket_start(at, unit)
+        expires_at = start + size + BUCKET_RETENTION[unit]
+        if expires_at <= now:
+            # Older than every window using this unit; nothing to adjust
+            continue
+        for tag in tags:
+            requests.append(UpdateOne(
+                {"tag": tag, "unit": unit, "start": start},
+                {"$inc": {"count": delta}, "$setOnInsert": {"expiresAt": expires_at}},
+                upsert=True
+            ))
+    if requests:
+        await db.tag_stats.bulk_write(requests, ordered=False)
+
+
+async def compute_trending(db, window: str, limit: int) -> List[dict]:
+    """Most used tags over a sliding window, summed from tag_stats buckets"""
+    length, unit = WINDOWS[window]
+    since = bucket_start(datetime.utcnow() - length, unit)
+    pipeline = [
+        {"$match": {"unit": unit, "start": {"$gt": since}}},
+        {"$group": {"_id": "$tag", "count": {"$sum": "$count"}}},
+        {"$match": {"count": {"$gt": 0}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "tag": "$_id", "count": 1}},
+    ]
+    return await db.tag_stats.aggregate(pipeline).to_list(length=limit)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class WorkerPool:
+    """Runs CPU-bound work (password hashing, image resizing) off the event loop.
+
+    At most ``max_concurrency`` jobs are handed to the executor at once; further
+    callers wait on a semaphore, and the number of waiters is reported as the
+    queue depth.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 1, max_concurrency: Optional[int] = None,
+                 name: str = "worker"):
+        if mode not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown {name} executor: {mode}")
+        self.name = name
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_concurrency = max(1, max_concurrency or self.workers)
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._max_waiting = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool, honouring the concurrency cap"""
+        if self.mode == "inline":
+            started = time.perf_counter()
+            result = func(*args)
+            self._total_run += time.perf_counter() - started
+            self._completed += 1
+            return result
+
+        semaphore = self._get_semaphore()
+        queued = time.perf_counter()
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started = time.perf_counter()
+        self._total_wait += started - queued
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_run += time.perf_counter() - started
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and timing counters"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "max_queue_depth": self._max_waiting,
+            "completed": self._completed,
+            "total_wait_seconds": self._total_wait,
+            "total_run_seconds": self._total_run,
+        }
+
+    def configure(self, mode: Optional[str] = None, workers: Optional[int] = None,
+                  max_concurrency: Optional[int] = None):
+        """Reconfigure the pool; the executor is recreated on next use"""
+        self.shutdown()
+        self.__init__(
+            mode or self.mode,
+            workers or self.workers,
+            max_concurrency or (workers or self.max_concurrency),
+            self.name,
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
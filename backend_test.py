@@ -7,6 +7,8 @@ Tests all authentication and user endpoints
 import requests
 import json
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 # Base URL from frontend .env
@@ -300,6 +302,101 @@ class FlowArtAPITester:
             self.log_result(test_name, False, f"Exception: {str(e)}")
             return False
     
+    def test_concurrent_registration(self) -> bool:
+        """Test simultaneous sign-ups for the same username and the same email"""
+        test_name = "POST /api/auth/register (concurrent)"
+        
+        try:
+            run_id = uuid.uuid4().hex[:8]
+            username = f"race_{run_id}"
+            
+            def register(email):
+                return requests.post(
+                    f"{self.base_url}/api/auth/register",
+                    json={"name": "Race Tester", "username": username, "email": email, "password": "password123"},
+                    headers={"Content-Type": "application/json"}
+                )
+            
+            # Same username, distinct emails: every sign-up succeeds with a unique username
+            emails = [f"race_{run_id}_{i}@flowart.app" for i in range(20)]
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                responses = list(executor.map(register, emails))
+            
+            statuses = [r.status_code for r in responses]
+            if any(code != 201 for code in statuses):
+                self.log_result(test_name, False, f"Same-username sign-ups returned {statuses}")
+                return False
+            usernames = [r.json()["user"]["username"] for r in responses]
+            if len(set(usernames)) != len(usernames):
+                self.log_result(test_name, False, "Duplicate usernames were assigned", {"usernames": usernames})
+                return False
+            
+            # Same email: exactly one sign-up wins, the rest get 400
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                responses = list(executor.map(register, [f"race_{run_id}_dup@flowart.app"] * 10))
+            
+            statuses = sorted(r.status_code for r in responses)
+            if statuses != [201] + [400] * 9:
+                self.log_result(test_name, False, f"Same-email sign-ups returned {statuses}")
+                return False
+            
+            self.log_result(test_name, True, "Concurrent sign-ups produced unique usernames and a single account per email")
+            return True
+                
+        except Exception as e:
+            self.log_result(test_name, False, f"Exception: {str(e)}")
+            return False
+    
+    def test_refresh_and_logout(self) -> bool:
+        """Test refresh token rotation and revocation on logout"""
+        test_name = "POST /api/auth/refresh + /api/auth/logout"
+        
+        try:
+            run_id = uuid.uuid4().hex[:8]
+            response = self.session.post(
+                f"{self.base_url}/api/auth/register",
+                json={"name": "Refresh Tester", "email": f"refresh_{run_id}@flowart.app", "password": "password123"},
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code != 201 or "refresh_token" not in response.json():
+                self.log_result(test_name, False, f"Registration returned no refresh token: HTTP {response.status_code}")
+                return False
+            first_refresh = response.json()["refresh_token"]
+            
+            # Exchange once; the same refresh token must not work twice
+            response = self.session.post(f"{self.base_url}/api/auth/refresh", json={"refresh_token": first_refresh})
+            if response.status_code != 200:
+                self.log_result(test_name, False, f"Refresh failed: HTTP {response.status_code}: {response.text}")
+                return False
+            tokens = response.json()
+            response = self.session.post(f"{self.base_url}/api/auth/refresh", json={"refresh_token": first_refresh})
+            if response.status_code != 401:
+                self.log_result(test_name, False, f"Reused refresh token returned HTTP {response.status_code}")
+                return False
+            
+            # Logout revokes both tokens
+            headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+            response = self.session.post(
+                f"{self.base_url}/api/auth/logout",
+                json={"refresh_token": tokens["refresh_token"]},
+                headers=headers
+            )
+            if response.status_code != 204:
+                self.log_result(test_name, False, f"Logout failed: HTTP {response.status_code}: {response.text}")
+                return False
+            me = self.session.get(f"{self.base_url}/api/auth/me", headers=headers)
+            again = self.session.post(f"{self.base_url}/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            if me.status_code != 401 or again.status_code != 401:
+                self.log_result(test_name, False, f"Revoked tokens still accepted: /me {me.status_code}, refresh {again.status_code}")
+                return False
+            
+            self.log_result(test_name, True, "Refresh tokens rotate and logout revokes the session")
+            return True
+                
+        except Exception as e:
+            self.log_result(test_name, False, f"Exception: {str(e)}")
+            return False
+    
     def run_all_tests(self):
         """Run all tests in sequence"""
         print("🚀 Starting FlowArt Backend API Tests")
@@ -312,6 +409,8 @@ class FlowArtAPITester:
         self.test_register()
         self.test_login()
         self.test_get_me()
+        self.test_concurrent_registration()
+        self.test_refresh_and_logout()
         
         # User endpoint tests
         print("👥 USER ENDPOINT TESTS")